@@ -12,6 +12,13 @@ from backend.routes.share import share_bp
 from backend.routes import users_bp
 from backend.config import get_config
 from backend.firebase_service import firebase_service
+from backend.job_snapshots import feed_snapshots
+from backend.click_buffer import click_buffer
+from backend.click_rollups import click_rollups
+from backend.project_search import project_search
+from backend.cache_tags import tagged_cache
+from backend.http_clients import provider_clients
+from backend.provider_health import provider_health
 
 
 def create_app() -> Flask:
@@ -22,8 +29,15 @@ def create_app() -> Flask:
     db.init_app(app)
     jwt.init_app(app)
     cache.init_app(app)
+    tagged_cache.init_app(app)
     cors.init_app(app, resources={r"/*": {"origins": app.config.get("CORS_ORIGINS", "*")}})
     limiter.init_app(app)
+    provider_clients.init_app(app)
+    provider_health.init_app(app)
+    feed_snapshots.init_app(app)
+    click_buffer.init_app(app)
+    click_rollups.init_app(app)
+    project_search.init_app(app)
     
     # Inicializar Firebase si está habilitado
     use_firebase = app.config.get("USE_FIREBASE", False)
@@ -53,6 +67,7 @@ def create_app() -> Flask:
         try:
             if app.config.get("AUTO_CREATE_DB", False):
                 db.create_all()
+                project_search.setup()
         except Exception as e:
             # Log error but don't fail startup (DB might not be accessible during init)
             import logging
@@ -0,0 +1,99 @@
+"""Tag-versioned cache keys on top of the Flask-Caching backend.
+
+Every tag has a version stored in the cache and a tagged key embeds the current
+version of each of its tags. Invalidating a tag gives it a new version, which
+orphans every key built from it while unrelated entries (jobs searches, AI
+descriptions, ...) stay warm. Orphaned entries simply expire on their timeout.
+
+Versions are only meaningful when every worker sees the same cache: with a
+per-process backend (``SimpleCache``) a write would bump the tags of one worker
+while the others kept serving stale entries. Tagged caching is therefore off
+unless ``CACHE_TYPE`` is shared (Redis, Memcached, filesystem) or
+``TAGGED_CACHE_ENABLED=true`` says the app runs in a single process.
+"""
+import time
+import logging
+
+from backend.extensions import cache
+
+logger = logging.getLogger(__name__)
+
+# Cache backends that live inside one worker process
+_LOCAL_BACKENDS = {"null", "nullcache", "simple", "simplecache"}
+
+# Explore feed across all categories: pages, counts and page anchors
+FEED_TAG = "projects:feed"
+
+
+def feed_category_tag(category: str) -> str:
+    """Explore feed filtered to one category, untouched by writes elsewhere."""
+    return f"projects:feed:{category}"
+
+
+class TaggedCache:
+    """Reads and writes cache entries whose keys are scoped by invalidation tags."""
+
+    def __init__(self, backend):
+        self._cache = backend
+        self.enabled = True
+
+    def init_app(self, app):
+        setting = str(app.config.get("TAGGED_CACHE_ENABLED", "auto")).lower()
+        if setting == "auto":
+            cache_type = str(app.config.get("CACHE_TYPE", "")).rsplit(".", 1)[-1].lower()
+            self.enabled = cache_type not in _LOCAL_BACKENDS
+        else:
+            self.enabled = setting == "true"
+        if not self.enabled:
+            logger.info("tagged cache disabled: CACHE_TYPE is not shared between workers")
+
+    @staticmethod
+    def _version_key(tag: str) -> str:
+        return f"tagver:{tag}"
+
+    def version(self, tag: str) -> str:
+        key = self._version_key(tag)
+        value = self._cache.get(key)
+        if value is None:
+            # A fresh (time-based) version never collides with keys written
+            # before the counter was evicted
+            self._cache.add(key, str(time.time_ns()), timeout=0)
+            value = self._cache.get(key) or "0"
+        return value
+
+    def key(self, base: str, tags) -> str:
+        return base + "@" + ".".join(self.version(t) for t in tags)
+
+    def get(self, base: str, tags):
+        if not self.enabled:
+            return None
+        return self._cache.get(self.key(base, tags))
+
+    def set(self, base: str, value, tags, timeout: int | None = None) -> None:
+        if self.enabled:
+            self._cache.set(self.key(base, tags), value, timeout=timeout)
+
+    def get_or_set(self, base: str, tags, compute, timeout: int | None = None):
+        """Cached value for ``base``, calling ``compute`` on a miss (None is not stored).
+
+        The key is resolved once, so a value computed while a write invalidates
+        one of the tags lands under the old, already orphaned version.
+        """
+        if not self.enabled:
+            return compute()
+        key = self.key(base, tags)
+        value = self._cache.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self._cache.set(key, value, timeout=timeout)
+        return value
+
+    def invalidate(self, *tags: str) -> None:
+        if not self.enabled:
+            return
+        for tag in tags:
+            self._cache.set(self._version_key(tag), str(time.time_ns()), timeout=0)
+
+
+tagged_cache = TaggedCache(cache)
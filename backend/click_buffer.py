@@ -0,0 +1,179 @@
+"""Write-behind buffer for ``JobClick`` rows.
+
+``/api/jobs/track-click`` used to add and commit one row per click, which costs
+an fsync on SQLite and a round trip on Postgres for every event. Clicks are now
+queued in memory and a background thread writes them with one multi-row
+``INSERT`` per batch, as soon as ``JOBS_CLICK_BATCH_SIZE`` rows are waiting or
+``JOBS_CLICK_FLUSH_INTERVAL`` seconds after the first one arrived. The queue is
+bounded: when the writer falls behind, producers wait briefly and are then
+refused so the endpoint can answer 503. Whatever is still queued is written when
+the worker exits.
+
+``created_at`` is stamped when the batch is inserted, not when the click was
+queued: the click rollups treat rows older than their lag as final, which only
+holds if the stamp is taken right before the row's id is assigned and committed.
+Normally the two differ by at most ``JOBS_CLICK_FLUSH_INTERVAL``.
+"""
+import os
+import queue
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class ClickBuffer:
+    """Bounded queue of click rows plus the thread that bulk-inserts them."""
+
+    def __init__(self):
+        self.batch_size = 200
+        self.flush_interval = 2.0
+        self.max_queued = 10000
+        self.enqueue_timeout = 0.25
+        self._app = None
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_queued)
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {"enqueued": 0, "rejected": 0, "written": 0, "batches": 0, "failed": 0}
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # Rows queued before the fork belong to the parent; the child starts empty
+        # with fresh locks in case the fork happened while another thread held one
+        self._queue = queue.Queue(maxsize=self.max_queued)
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    def init_app(self, app):
+        self._app = app
+        self.batch_size = max(1, int(app.config.get("JOBS_CLICK_BATCH_SIZE", self.batch_size)))
+        self.flush_interval = float(app.config.get("JOBS_CLICK_FLUSH_INTERVAL", self.flush_interval))
+        self.max_queued = max(self.batch_size, int(app.config.get("JOBS_CLICK_QUEUE_MAX", self.max_queued)))
+        self._queue = queue.Queue(maxsize=self.max_queued)
+
+    def enqueue(self, user_id: int | None, url: str, title: str, company: str, source: str) -> bool:
+        """Queue one click; False when the buffer stayed full (caller should shed load)."""
+        self.ensure_started()
+        row = {
+            "user_id": user_id,
+            "url": url[:512],
+            "title": title[:255],
+            "company": company[:255],
+            "source": source[:64],
+        }
+        try:
+            self._queue.put(row, timeout=self.enqueue_timeout)
+        except queue.Full:
+            self._count("rejected")
+            return False
+        self._count("enqueued")
+        return True
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += n
+
+    def ensure_started(self) -> None:
+        """Start the writer thread once per process (threads do not survive fork)."""
+        if self._stop.is_set() or (self._thread is not None and self._pid == os.getpid()):
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="jobs-click-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._take_batch()
+            if batch:
+                self._write(batch)
+
+    def _take_batch(self) -> list[dict]:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self) -> list[dict]:
+        rows = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                return rows
+
+    def _write(self, rows: list[dict]) -> None:
+        if self._app is None:
+            logger.error("click buffer used before init_app, dropping %s clicks", len(rows))
+            self._count("failed", len(rows))
+            return
+        from backend.extensions import db
+        from backend.models import JobClick
+
+        with self._write_lock, self._app.app_context():
+            try:
+                now = datetime.utcnow()
+                for row in rows:
+                    row["created_at"] = now
+                # A list of parameter dicts makes SQLAlchemy run one executemany /
+                # multi-row VALUES insert instead of one statement per click
+                db.session.execute(db.insert(JobClick), rows)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                self._count("failed", len(rows))
+                logger.error("click buffer flush of %s rows failed: %s", len(rows), e)
+                return
+            finally:
+                db.session.remove()
+        self._count("written", len(rows))
+        self._count("batches")
+
+    def flush(self) -> int:
+        """Write everything queued right now, synchronously; returns the row count."""
+        rows = self._drain()
+        for i in range(0, len(rows), self.batch_size):
+            self._write(rows[i:i + self.batch_size])
+        return len(rows)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop the writer and persist every queued click (runs at worker exit)."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and self._pid == os.getpid():
+            # The writer finishes the batch it is holding before it notices the flag
+            thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            data = dict(self._stats)
+        data["queued"] = self._queue.qsize()
+        data["max_queued"] = self.max_queued
+        return data
+
+
+click_buffer = ClickBuffer()
+atexit.register(click_buffer.close)
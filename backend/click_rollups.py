@@ -0,0 +1,254 @@
+"""Incremental hourly/daily rollups of ``job_clicks``.
+
+A background thread periodically folds the clicks written since the last run
+into ``job_click_rollups`` (one row per period, bucket, url, source and
+company) and advances a high-water mark on ``job_clicks.id`` stored in
+``rollup_state``. History is never rescanned. Rows younger than
+``JOBS_ROLLUP_LAG`` seconds are left for the next run: click ids are assigned at
+insert time by several buffered writers, so a lower id can become visible after
+a higher one, and the mark only moves past ids that are old enough to be final.
+That relies on ``created_at`` being stamped when the batch is inserted (see
+``click_buffer``) and on every insert committing within the lag.
+The mark is advanced with a compare-and-set in the same transaction as the
+counts, so two workers running the job at once cannot count a click twice.
+"""
+import os
+import math
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from backend.extensions import db
+from backend.db_utils import dialect_insert
+from backend.models import JobClick, JobClickRollup, RollupState
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "job_clicks"
+PERIODS = ("hour", "day")
+# Clicks older than this no longer count towards search ranking popularity
+POPULARITY_DAYS = 7
+
+
+def bucket_start(period: str, ts: datetime) -> datetime:
+    if period == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class ClickRollups:
+    """Keeps the click rollup tables current and answers trending queries."""
+
+    def __init__(self):
+        self._app = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+        self.interval = 60.0
+        self.lag = 30.0
+        self.batch_size = 5000
+        self.hourly_retention_days = 14
+        self._last_run: dict = {}
+        self._popularity: dict[str, float] = {}
+
+    def init_app(self, app):
+        self._app = app
+        self.interval = float(app.config.get("JOBS_ROLLUP_INTERVAL", self.interval))
+        self.lag = float(app.config.get("JOBS_ROLLUP_LAG", self.lag))
+        self.hourly_retention_days = int(app.config.get("JOBS_ROLLUP_HOURLY_RETENTION_DAYS", self.hourly_retention_days))
+
+    def ensure_started(self) -> None:
+        """Start the rollup thread once per process (threads do not survive fork)."""
+        if self._app is None or (self._thread is not None and self._pid == os.getpid()):
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="jobs-click-rollups", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._app.app_context():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning("click rollup failed: %s", e)
+                finally:
+                    db.session.remove()
+            time.sleep(self.interval)
+
+    def run_once(self) -> int:
+        """Fold every final click past the high-water mark into the rollups; returns rows folded."""
+        started = time.monotonic()
+        folded = 0
+        while True:
+            n = self._step()
+            folded += n
+            if n < self.batch_size:
+                break
+        self._prune()
+        self._refresh_popularity()
+        self._last_run = {
+            "at": datetime.utcnow().isoformat() + "Z",
+            "folded": folded,
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        return folded
+
+    def _high_water(self) -> int:
+        state = db.session.get(RollupState, STATE_NAME)
+        if state is None:
+            db.session.add(RollupState(name=STATE_NAME, last_id=0))
+            db.session.commit()
+            return 0
+        return state.last_id
+
+    def _step(self) -> int:
+        last_id = self._high_water()
+        cutoff = datetime.utcnow() - timedelta(seconds=self.lag)
+        # Stop before the first click that is too recent: everything below it is final
+        unsettled = (
+            db.session.query(func.min(JobClick.id))
+            .filter(JobClick.id > last_id, JobClick.created_at > cutoff)
+            .scalar()
+        )
+        query = db.session.query(
+            JobClick.id, JobClick.url, JobClick.source, JobClick.company, JobClick.title, JobClick.created_at
+        ).filter(JobClick.id > last_id)
+        if unsettled is not None:
+            query = query.filter(JobClick.id < unsettled)
+        rows = query.order_by(JobClick.id).limit(self.batch_size).all()
+        if not rows:
+            return 0
+
+        counts: dict[tuple, list] = {}
+        for row in rows:
+            created = row.created_at or cutoff
+            for period in PERIODS:
+                key = (period, bucket_start(period, created), row.url, row.source or "", row.company or "")
+                entry = counts.get(key)
+                if entry is None:
+                    counts[key] = [1, row.title or ""]
+                else:
+                    entry[0] += 1
+                    entry[1] = row.title or entry[1]
+
+        new_id = rows[-1].id
+        moved = (
+            db.session.query(RollupState)
+            .filter(RollupState.name == STATE_NAME, RollupState.last_id == last_id)
+            .update({"last_id": new_id, "updated_at": datetime.utcnow()}, synchronize_session=False)
+        )
+        if not moved:
+            # Another worker folded this range first
+            db.session.rollback()
+            return 0
+        self._upsert(counts)
+        db.session.commit()
+        return len(rows)
+
+    def _upsert(self, counts: dict) -> None:
+        values = [
+            {
+                "period": period,
+                "bucket_start": start,
+                "url": url,
+                "source": source,
+                "company": company,
+                "title": title[:255],
+                "clicks": n,
+            }
+            for (period, start, url, source, company), (n, title) in counts.items()
+        ]
+        insert = dialect_insert()
+        if insert is not None:
+            stmt = insert(JobClickRollup)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["period", "bucket_start", "url", "source", "company"],
+                set_={"clicks": JobClickRollup.clicks + stmt.excluded.clicks, "title": stmt.excluded.title},
+            )
+            db.session.execute(stmt, values)
+            return
+        for v in values:
+            existing = JobClickRollup.query.filter_by(
+                period=v["period"], bucket_start=v["bucket_start"], url=v["url"],
+                source=v["source"], company=v["company"],
+            ).first()
+            if existing is None:
+                db.session.add(JobClickRollup(**v))
+            else:
+                existing.clicks += v["clicks"]
+                existing.title = v["title"]
+
+    def _prune(self) -> None:
+        if self.hourly_retention_days <= 0:
+            return
+        limit = datetime.utcnow() - timedelta(days=self.hourly_retention_days)
+        JobClickRollup.query.filter(
+            JobClickRollup.period == "hour", JobClickRollup.bucket_start < limit
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+    def _refresh_popularity(self) -> None:
+        since = bucket_start("day", datetime.utcnow() - timedelta(days=POPULARITY_DAYS))
+        rows = (
+            db.session.query(JobClickRollup.url, func.sum(JobClickRollup.clicks))
+            .filter(JobClickRollup.period == "day", JobClickRollup.bucket_start >= since)
+            .group_by(JobClickRollup.url)
+            .all()
+        )
+        top = max((int(n) for _, n in rows), default=0)
+        # Log scale so one viral posting does not flatten everything else to ~0
+        scale = math.log1p(top) or 1.0
+        self._popularity = {url: round(math.log1p(int(n)) / scale, 4) for url, n in rows}
+
+    def popularity(self) -> dict[str, float]:
+        """Per-URL click popularity in [0, 1], recomputed after every rollup run."""
+        return self._popularity
+
+    def trending(self, hours: int, limit: int, source: str | None = None) -> dict:
+        """Most clicked postings over the last ``hours``, read from the rollups only."""
+        # Hourly buckets are exact up to two days; longer windows use the daily table
+        period = "hour" if hours <= 48 else "day"
+        since = bucket_start(period, datetime.utcnow() - timedelta(hours=hours))
+        total = func.sum(JobClickRollup.clicks).label("clicks")
+        query = db.session.query(
+            JobClickRollup.url,
+            JobClickRollup.source,
+            JobClickRollup.company,
+            func.max(JobClickRollup.title).label("title"),
+            total,
+        ).filter(JobClickRollup.period == period, JobClickRollup.bucket_start >= since)
+        if source:
+            query = query.filter(JobClickRollup.source == source)
+        rows = (
+            query.group_by(JobClickRollup.url, JobClickRollup.source, JobClickRollup.company)
+            .order_by(total.desc(), JobClickRollup.url)
+            .limit(limit)
+            .all()
+        )
+        return {
+            "items": [
+                {"url": r.url, "title": r.title, "company": r.company, "source": r.source, "clicks": int(r.clicks)}
+                for r in rows
+            ],
+            "hours": hours,
+            "period": period,
+        }
+
+    def status(self) -> dict:
+        return {
+            "interval": self.interval,
+            "lag": self.lag,
+            "last_run": self._last_run,
+            "popular_urls": len(self._popularity),
+        }
+
+
+click_rollups = ClickRollups()
@@ -18,11 +18,56 @@ class BaseConfig:
 
     CACHE_TYPE = os.getenv("CACHE_TYPE", "SimpleCache")
     CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", "300"))
+    # Feed snapshots/counts need a cache shared by all workers: "auto" enables them
+    # for shared CACHE_TYPEs only, "true" forces them on (single-process deployments)
+    TAGGED_CACHE_ENABLED = os.getenv("TAGGED_CACHE_ENABLED", "auto")
 
     RATELIMIT_DEFAULT = os.getenv("RATELIMIT_DEFAULT", "100 per minute")
 
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
+    # Jobs search: run providers concurrently and return whatever finished by the deadline
+    JOBS_CONCURRENT_FANOUT = os.getenv("JOBS_CONCURRENT_FANOUT", "true").lower() == "true"
+    JOBS_SEARCH_DEADLINE = float(os.getenv("JOBS_SEARCH_DEADLINE", "12"))
+    JOBS_FANOUT_WORKERS = int(os.getenv("JOBS_FANOUT_WORKERS", "16"))
+    # Pooled provider clients (one per provider, reused across requests)
+    JOBS_HTTP_TIMEOUT = float(os.getenv("JOBS_HTTP_TIMEOUT", "10"))
+    JOBS_HTTP_CONNECT_TIMEOUT = float(os.getenv("JOBS_HTTP_CONNECT_TIMEOUT", "5"))
+    JOBS_HTTP_MAX_CONNECTIONS = int(os.getenv("JOBS_HTTP_MAX_CONNECTIONS", "10"))
+    JOBS_HTTP_MAX_KEEPALIVE = int(os.getenv("JOBS_HTTP_MAX_KEEPALIVE", "10"))
+    JOBS_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("JOBS_HTTP_KEEPALIVE_EXPIRY", "30"))
+    JOBS_HTTP2 = os.getenv("JOBS_HTTP2", "true").lower() == "true"
+    # Provider circuit breaker and adaptive timeouts (p95 latency x factor, capped at JOBS_HTTP_TIMEOUT)
+    JOBS_BREAKER_FAILURES = int(os.getenv("JOBS_BREAKER_FAILURES", "3"))
+    JOBS_BREAKER_COOLDOWN = float(os.getenv("JOBS_BREAKER_COOLDOWN", "30"))
+    JOBS_BREAKER_MAX_COOLDOWN = float(os.getenv("JOBS_BREAKER_MAX_COOLDOWN", "600"))
+    JOBS_TIMEOUT_MIN = float(os.getenv("JOBS_TIMEOUT_MIN", "2"))
+    JOBS_TIMEOUT_FACTOR = float(os.getenv("JOBS_TIMEOUT_FACTOR", "3"))
+    # Full-feed providers (Remotive, Arbeitnow, RemoteOK) are served from in-memory snapshots
+    JOBS_SNAPSHOT_ENABLED = os.getenv("JOBS_SNAPSHOT_ENABLED", "true").lower() == "true"
+    JOBS_SNAPSHOT_INTERVAL = float(os.getenv("JOBS_SNAPSHOT_INTERVAL", "600"))
+    JOBS_SNAPSHOT_MAX_AGE = float(os.getenv("JOBS_SNAPSHOT_MAX_AGE", "3600"))
+    # Search results are fresh for JOBS_CACHE_TTL, then served stale while one refresh runs
+    JOBS_CACHE_TTL = float(os.getenv("JOBS_CACHE_TTL", "300"))
+    JOBS_CACHE_STALE_TTL = float(os.getenv("JOBS_CACHE_STALE_TTL", "1800"))
+    # Job clicks are buffered and bulk-inserted by a background writer
+    JOBS_CLICK_BATCH_SIZE = int(os.getenv("JOBS_CLICK_BATCH_SIZE", "200"))
+    JOBS_CLICK_FLUSH_INTERVAL = float(os.getenv("JOBS_CLICK_FLUSH_INTERVAL", "2"))
+    JOBS_CLICK_QUEUE_MAX = int(os.getenv("JOBS_CLICK_QUEUE_MAX", "10000"))
+    # Hourly/daily click rollups behind /api/jobs/trending, folded in incrementally
+    JOBS_ROLLUP_INTERVAL = float(os.getenv("JOBS_ROLLUP_INTERVAL", "60"))
+    JOBS_ROLLUP_LAG = float(os.getenv("JOBS_ROLLUP_LAG", "30"))
+    JOBS_ROLLUP_HOURLY_RETENTION_DAYS = int(os.getenv("JOBS_ROLLUP_HOURLY_RETENTION_DAYS", "14"))
+    # Removed favorites are kept as sync tombstones this long (0 keeps them forever)
+    FAVORITES_TOMBSTONE_DAYS = int(os.getenv("FAVORITES_TOMBSTONE_DAYS", "30"))
+    # Favorite changes younger than this (seconds) are resent by the next ?since= sync
+    FAVORITES_SYNC_LAG = float(os.getenv("FAVORITES_SYNC_LAG", "5"))
+    # First explore feed pages per category/order are served from cached snapshots
+    PROJECTS_FEED_CACHED_PAGES = int(os.getenv("PROJECTS_FEED_CACHED_PAGES", "3"))
+    PROJECTS_FEED_CACHE_TTL = int(os.getenv("PROJECTS_FEED_CACHE_TTL", "300"))
+    # Firestore project search keeps an in-memory index, reloaded this often (seconds)
+    PROJECT_SEARCH_REFRESH = float(os.getenv("PROJECT_SEARCH_REFRESH", "300"))
+
     AUTO_CREATE_DB = os.getenv("AUTO_CREATE_DB", "false").lower() == "true"
 
     # Firebase configuration
@@ -0,0 +1,119 @@
+"""Small SQL helpers shared by the routes and background jobs."""
+import re
+import json
+
+from sqlalchemy.types import Text, TypeDecorator
+
+from backend.extensions import db
+
+
+def dialect_insert():
+    """``insert`` construct with ON CONFLICT support for the current database, or None.
+
+    Postgres and SQLite both support ``INSERT ... ON CONFLICT DO UPDATE``; other
+    backends have to fall back to select-then-update.
+    """
+    name = db.session.get_bind().dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+# A single URL or path; commas inside it (e.g. image transformations) are kept
+_URL_RE = re.compile(r"^(?:[a-z][a-z0-9+.-]*://|/)\S*$", re.IGNORECASE)
+
+
+def _clean(items) -> list[str]:
+    return [str(x).strip() for x in items if x is not None and str(x).strip()]
+
+
+def coerce_list(raw) -> list[str]:
+    """Normalize a list field (native list, JSON array text or legacy plain text)
+    to trimmed, non-empty strings.
+
+    Legacy rows may hold plain text separated by newlines/commas; those are
+    split the way the share pages always read them, except that a line that is
+    a URL or path is kept whole.
+    """
+    if raw is None or raw == "":
+        return []
+    if isinstance(raw, (list, tuple)):
+        return _clean(raw)
+    text = str(raw)
+    try:
+        data = json.loads(text)
+        if isinstance(data, list):
+            return _clean(data)
+        if data is None:
+            return []
+    except ValueError:
+        pass
+    parts = []
+    for line in text.split("\n"):
+        line = line.strip()
+        parts.extend([line] if _URL_RE.match(line) else line.split(","))
+    return _clean(parts)
+
+
+class JsonArray(list):
+    """List loaded from a ``JSONList`` column that keeps its JSON text, so the
+    legacy string form of the API is encoded at most once per loaded value."""
+
+    def __init__(self, items=(), text: str | None = None):
+        super().__init__(items)
+        self._text = text
+
+    @property
+    def json(self) -> str:
+        if self._text is None:
+            self._text = json.dumps(list(self))
+        return self._text
+
+
+def legacy_json(value) -> str:
+    """JSON-string form of a list field, as the API has always returned it."""
+    if isinstance(value, JsonArray):
+        return value.json
+    if isinstance(value, str):
+        return value or "[]"
+    return json.dumps(value) if value else "[]"
+
+
+class JSONList(TypeDecorator):
+    """JSON array column: JSONB on Postgres, JSON text elsewhere (SQLite has no
+    native JSON type; its JSON functions work on text). Loads as ``JsonArray``."""
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import JSONB
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(Text())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        items = coerce_list(value)
+        if dialect.name == "postgresql":
+            return items
+        return json.dumps(items)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return JsonArray()
+        if isinstance(value, str):
+            try:
+                data = json.loads(value)
+            except ValueError:
+                data = None
+            if isinstance(data, list):
+                # The stored text already is the API's string form
+                return JsonArray(data, value)
+            return JsonArray(coerce_list(value))
+        return JsonArray(value)
@@ -151,14 +151,16 @@ class FirebaseService:
         data['id'] = doc.id
         return data
     
-    def get_user_projects(self, user_id: str) -> List[Dict[str, Any]]:
-        """Obtiene todos los proyectos de un usuario."""
+    def get_user_projects(self, user_id: str, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Obtiene todos los proyectos de un usuario (``fields``: máscara de campos)."""
         if not self.is_enabled or not user_id:
             return []
         
         # user_id puede ser string (desde JWT) o necesitar conversión
         # Sin order_by en la query para evitar requerir índice compuesto
         query = self._db.collection('projects').where('user_id', '==', str(user_id))
+        if fields:
+            query = query.select(fields)
         docs = query.stream()
         projects = []
         for doc in docs:
@@ -195,6 +197,90 @@ class FirebaseService:
             projects.append(data)
         return projects
     
+    def query_documents(
+        self,
+        collection: str,
+        filters: Optional[List[tuple]] = None,
+        order_by: Optional[List[tuple]] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[list] = None,
+        offset: int = 0,
+        select: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Consulta resuelta en el servidor: filtros, orden, límite y cursor.
+
+        ``filters`` son tuplas ``(campo, operador, valor)`` y ``order_by`` tuplas
+        ``(campo, descendente)``; el campo ``__name__`` es el id del documento.
+        ``start_after`` lleva un valor por cada campo de ``order_by``. Cada
+        combinación de filtros y orden necesita su índice en firestore.indexes.json.
+        ``select`` es una máscara de campos: solo esos se descargan.
+        """
+        if not self.is_enabled:
+            return []
+
+        query = self._db.collection(collection)
+        for field, op, value in filters or []:
+            query = query.where(field, op, value)
+        if select:
+            query = query.select(select)
+        for field, descending in order_by or []:
+            path = firestore.FieldPath.document_id() if field == '__name__' else field
+            direction = firestore.Query.DESCENDING if descending else firestore.Query.ASCENDING
+            query = query.order_by(path, direction=direction)
+        if start_after:
+            # Un id (string) en la posición de __name__ se convierte en referencia
+            query = query.start_after(list(start_after))
+        if offset:
+            query = query.offset(offset)
+        if limit:
+            query = query.limit(limit)
+        results = []
+        for doc in query.stream():
+            data = doc.to_dict()
+            data['id'] = doc.id
+            results.append(data)
+        return results
+
+    def count_documents(self, collection: str, filters: Optional[List[tuple]] = None) -> int:
+        """Cuenta documentos con una agregación count() (sin descargarlos)."""
+        if not self.is_enabled:
+            return 0
+
+        query = self._db.collection(collection)
+        for field, op, value in filters or []:
+            query = query.where(field, op, value)
+        result = query.count().get()
+        return int(result[0][0].value)
+
+    def get_projects_page(
+        self,
+        limit: int,
+        category: Optional[str] = None,
+        descending: bool = True,
+        start_after: Optional[tuple] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Una página de proyectos ordenada por (created_at, id).
+
+        ``start_after`` es la posición ``(created_at, id)`` del último proyecto de
+        la página anterior; solo se leen ``limit`` documentos (y solo ``fields``).
+        """
+        filters = [('category', '==', category)] if category else []
+        return self.query_documents(
+            'projects',
+            filters=filters,
+            order_by=[('created_at', descending), ('__name__', descending)],
+            limit=limit,
+            start_after=[start_after[0], str(start_after[1])] if start_after else None,
+            offset=offset,
+            select=fields,
+        )
+
+    def count_projects(self, category: Optional[str] = None) -> int:
+        """Total de proyectos (opcionalmente de una categoría)."""
+        return self.count_documents('projects', [('category', '==', category)] if category else [])
+
     def delete_project(self, project_id: str) -> None:
         """Elimina un proyecto."""
         if not self.is_enabled:
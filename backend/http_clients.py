@@ -0,0 +1,106 @@
+"""Pooled outbound HTTP clients for the job providers.
+
+One ``httpx.Client`` per provider is kept for the life of the worker process so
+repeated searches reuse keep-alive connections instead of paying a new TCP+TLS
+handshake on every cache miss. Clients are dropped after ``fork()`` so gunicorn
+workers never share sockets with the master process.
+"""
+import os
+import atexit
+import logging
+import threading
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (httpx only negotiates HTTP/2 when h2 is installed)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+USER_AGENT = "InnovateJobs/1.0"
+
+# Extra headers some providers need (RemoteOK and Indeed reject the default UA)
+PROVIDER_HEADERS = {
+    "remoteok": {"User-Agent": USER_AGENT},
+    "indeed": {"User-Agent": USER_AGENT},
+}
+
+
+class ProviderClients:
+    """Process-wide registry of pooled clients, one per provider."""
+
+    def __init__(self):
+        self._clients: dict[str, httpx.Client] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.timeout = 10.0
+        self.connect_timeout = 5.0
+        self.max_connections = 10
+        self.max_keepalive = 10
+        self.keepalive_expiry = 30.0
+        self.http2 = True
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def init_app(self, app):
+        self.timeout = float(app.config.get("JOBS_HTTP_TIMEOUT", self.timeout))
+        self.connect_timeout = float(app.config.get("JOBS_HTTP_CONNECT_TIMEOUT", self.connect_timeout))
+        self.max_connections = max(1, int(app.config.get("JOBS_HTTP_MAX_CONNECTIONS", self.max_connections)))
+        self.max_keepalive = int(app.config.get("JOBS_HTTP_MAX_KEEPALIVE", self.max_keepalive))
+        self.keepalive_expiry = float(app.config.get("JOBS_HTTP_KEEPALIVE_EXPIRY", self.keepalive_expiry))
+        self.http2 = bool(app.config.get("JOBS_HTTP2", self.http2))
+
+    def _after_fork(self):
+        # Never close inherited clients here: the sockets still belong to the parent
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def get(self, provider: str) -> httpx.Client:
+        """Return the shared client for ``provider``, creating it on first use."""
+        if self._pid != os.getpid():
+            self._after_fork()
+        client = self._clients.get(provider)
+        if client is not None and not client.is_closed:
+            return client
+        with self._lock:
+            client = self._clients.get(provider)
+            if client is None or client.is_closed:
+                client = self._build(provider)
+                self._clients[provider] = client
+            return client
+
+    def _build(self, provider: str) -> httpx.Client:
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=min(self.max_connections, self.max_keepalive),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        http2 = _HTTP2_AVAILABLE and self.http2
+        logger.info("http client for %s (http2=%s, max_connections=%s)", provider, http2, self.max_connections)
+        return httpx.Client(
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=limits,
+            http2=http2,
+            headers=PROVIDER_HEADERS.get(provider),
+        )
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for client in clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+
+
+provider_clients = ProviderClients()
+atexit.register(provider_clients.close)
+
+
+def provider_client(provider: str) -> httpx.Client:
+    """Shortcut for ``provider_clients.get(provider)``."""
+    return provider_clients.get(provider)
@@ -0,0 +1,158 @@
+"""Near-duplicate detection for job postings merged from several providers.
+
+The same offer syndicated through Adzuna and Indeed comes back with different
+redirect URLs and slightly different titles, so exact ``(title, company, url)``
+matching misses it. Each posting gets a 64-bit SimHash over character 3-grams of
+its canonical title, company and location (accent-folded, punctuation,
+work-mode words and legal suffixes removed). Signatures are memoized per
+canonical string, so a posting that stays in a feed snapshot is only hashed
+once. Collapsing uses eight 8-bit bands as LSH buckets: two signatures within 7
+bits share at least one band, so each posting is compared only with its bucket
+mates and the pass stays linear in the number of postings.
+
+Two close signatures are only treated as the same offer when the canonical
+locations are equal and the postings come from different providers, or from
+one provider under URLs that point at the same listing (same host and path).
+Postings with no title and company text are never collapsed.
+"""
+from urllib.parse import urlsplit
+import re
+import hashlib
+from functools import lru_cache
+from typing import Callable
+
+# Syndicated copies canonicalize to the same text (0 bits). A typo or "front end"
+# vs "frontend" already drifts 6-7 bits, as close as distinct roles such as
+# "Customer Service Representative" vs "... Spanish" (8), so only near-identical
+# signatures collapse
+MAX_DISTANCE = 3
+_BANDS = 8
+_BAND_BITS = 64 // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Words that differ between syndicated copies of the same offer
+_NOISE_WORDS = {
+    "remote", "remoto", "remota", "hybrid", "hibrido", "presencial",
+    "inc", "ltd", "llc", "sas", "srl", "gmbh", "corp", "de", "cv", "the",
+}
+
+
+def _canonical(text: str) -> str:
+    # Single characters are kept: "Data Analyst I" and "Data Analyst II" are different roles
+    return " ".join(w for w in _WORD_RE.findall(text) if w not in _NOISE_WORDS)
+
+
+def _listing_key(url: str) -> str:
+    """Host and path of a posting URL: tracking parameters do not make a new listing."""
+    parts = urlsplit((url or "").strip().lower())
+    return parts.netloc.removeprefix("www.") + parts.path.rstrip("/")
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+@lru_cache(maxsize=50000)
+def simhash(text: str) -> int:
+    """64-bit SimHash of the character 3-grams of ``text`` (already normalized)."""
+    text = " ".join(text.split())
+    if len(text) < 3:
+        return _feature_hash(text)
+    weights = [0] * 64
+    for gram in {text[i:i + 3] for i in range(len(text) - 2)}:
+        h = _feature_hash(gram)
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    out = 0
+    for bit in range(64):
+        if weights[bit] > 0:
+            out |= 1 << bit
+    return out
+
+
+def richness(item: dict) -> int:
+    """How much useful detail a posting carries; the richest duplicate is kept."""
+    score = 0
+    if item.get("salary_min") or item.get("salary_max"):
+        score += 4
+    if item.get("contract_time"):
+        score += 1
+    if item.get("contract_type"):
+        score += 1
+    if item.get("location"):
+        score += 1
+    if item.get("company") and item.get("company") != "Indeed":
+        score += 1
+    return score
+
+
+class NearDuplicateIndex:
+    """Banded SimHash buckets over the postings kept so far."""
+
+    def __init__(self, normalize: Callable[[str], str], max_distance: int = MAX_DISTANCE):
+        self._normalize = normalize
+        self._max_distance = max_distance
+        self._signatures: list[int] = []
+        self._meta: list[tuple[str, str, str]] = []
+        self._buckets: dict[tuple[int, int], list[int]] = {}
+
+    def _location(self, item: dict) -> str:
+        return _canonical(self._normalize(f"{item.get('location') or ''} {item.get('country') or ''}"))
+
+    def signature(self, item: dict) -> int | None:
+        """SimHash of the posting, or None when it has no title/company text to compare."""
+        title = _canonical(self._normalize(item.get("title") or ""))
+        company = _canonical(self._normalize(item.get("company") or ""))
+        if not title and not company:
+            return None
+        return simhash(f"{title} | {company} | {self._location(item)}")
+
+    def _meta_of(self, item: dict) -> tuple[str, str, str]:
+        return self._location(item), item.get("source") or "", _listing_key(item.get("url") or "")
+
+    def find(self, sig: int, item: dict) -> int | None:
+        """Position of a kept copy of ``item``: within ``max_distance`` bits, same
+        location, and another provider or the same listing URL."""
+        location, source, listing = self._meta_of(item)
+        for band in range(_BANDS):
+            key = (band, sig >> (band * _BAND_BITS) & _BAND_MASK)
+            for pos in self._buckets.get(key, ()):
+                if (self._signatures[pos] ^ sig).bit_count() > self._max_distance:
+                    continue
+                kept_location, kept_source, kept_listing = self._meta[pos]
+                if kept_location != location:
+                    continue
+                if kept_source != source or (listing and kept_listing == listing):
+                    return pos
+        return None
+
+    def add(self, sig: int, item: dict) -> int:
+        pos = len(self._signatures)
+        self._signatures.append(sig)
+        self._meta.append(self._meta_of(item))
+        for band in range(_BANDS):
+            key = (band, sig >> (band * _BAND_BITS) & _BAND_MASK)
+            self._buckets.setdefault(key, []).append(pos)
+        return pos
+
+
+def collapse_near_duplicates(items: list, normalize: Callable[[str], str]) -> list:
+    """Drop near-duplicates, keeping the first position and the richest record."""
+    index = NearDuplicateIndex(normalize)
+    out: list = []
+    slots: list[int] = []  # index position -> position in ``out``
+    for item in items:
+        sig = index.signature(item)
+        if sig is None:
+            out.append(item)
+            continue
+        pos = index.find(sig, item)
+        if pos is None:
+            index.add(sig, item)
+            slots.append(len(out))
+            out.append(item)
+        elif richness(item) > richness(out[slots[pos]]):
+            out[slots[pos]] = item
+    return out
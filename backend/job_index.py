@@ -0,0 +1,174 @@
+"""Inverted index over the normalized job postings held in feed snapshots.
+
+Records come from ``job_snapshots`` already accent-folded and lower-cased, so the
+index only has to split them into tokens. Keyword lookups become set
+intersections over token postings and location rules become intersections with
+precomputed facet sets, instead of substring scans over every posting.
+
+Keyword matching keeps the substring semantics of the live feed filters: a
+posting matches when the normalized query occurs anywhere in its text, so
+"script" matches "javascript" and "c++" does not match plain "c". Tokens keep
+``+`` and ``#`` ("c++", "c#"); each query token selects the postings of every
+indexed word containing it, and the candidates are then checked against the
+whole query so multi-word phrases match exactly as before.
+"""
+import re
+import threading
+from typing import Callable, Iterable
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Index tokens also keep "+" and "#" so "c++" and "c#" stay distinct from "c"
+_INDEX_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+# Query tokens whose vocabulary expansion is remembered until the vocabulary changes
+_EXPANSION_CACHE_MAX = 1024
+
+
+def tokenize(text: str) -> list[str]:
+    """Split normalized text into index tokens."""
+    return _TOKEN_RE.findall(text or "")
+
+
+def _index_tokens(text: str) -> list[str]:
+    return _INDEX_TOKEN_RE.findall(text or "")
+
+
+def _doc_key(record: dict) -> tuple:
+    item = record["item"]
+    return (item.get("url"), record["title"], record["company"])
+
+
+def _changed(old: dict, new: dict) -> bool:
+    return old["text"] != new["text"] or old["remote"] != new["remote"]
+
+
+class PostingIndex:
+    """Token and facet postings for several sources, updated one source at a time."""
+
+    def __init__(self, facet_fn: Callable[[dict], Iterable[str]]):
+        self._facet_fn = facet_fn
+        self._docs: dict[int, dict] = {}
+        self._positions: dict[int, int] = {}
+        self._keys: dict[str, dict[tuple, int]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._facets: dict[str, set[int]] = {}
+        self._vocab: list[str] | None = []
+        self._expansions: dict[str, list[str]] = {}
+        self._next_id = 0
+        self._lock = threading.RLock()
+
+    def has_source(self, source: str) -> bool:
+        return source in self._keys
+
+    def update_source(self, source: str, records: list) -> None:
+        """Replace the documents of ``source``, touching only what changed."""
+        with self._lock:
+            old = self._keys.get(source, {})
+            new: dict[tuple, int] = {}
+            for pos, record in enumerate(records):
+                key = _doc_key(record)
+                if key in new:
+                    continue
+                doc_id = old.get(key)
+                if doc_id is not None and _changed(self._docs[doc_id], record):
+                    self._remove(doc_id)
+                    doc_id = None
+                if doc_id is None:
+                    doc_id = self._add(source, record)
+                else:
+                    self._docs[doc_id] = record
+                new[key] = doc_id
+                self._positions[doc_id] = pos
+            for key, doc_id in old.items():
+                if new.get(key) != doc_id:
+                    self._remove(doc_id)
+            self._keys[source] = new
+
+    def _add(self, source: str, record: dict) -> int:
+        doc_id = self._next_id
+        self._next_id += 1
+        self._docs[doc_id] = record
+        for token in set(_index_tokens(record["text"])):
+            ids = self._postings.get(token)
+            if ids is None:
+                self._postings[token] = ids = set()
+                self._vocab = None
+            ids.add(doc_id)
+        for facet in (f"source:{source}", *self._facet_fn(record)):
+            self._facets.setdefault(facet, set()).add(doc_id)
+        return doc_id
+
+    def _remove(self, doc_id: int) -> None:
+        record = self._docs.pop(doc_id, None)
+        self._positions.pop(doc_id, None)
+        if record is None:
+            return
+        for token in set(_index_tokens(record["text"])):
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(doc_id)
+            if not ids:
+                del self._postings[token]
+                self._vocab = None
+        for ids in self._facets.values():
+            ids.discard(doc_id)
+
+    def match(self, query: str) -> set[int] | None:
+        """Ids of documents whose text contains ``query`` as a substring.
+
+        Returns None for an empty query, meaning "no keyword restriction".
+        """
+        query = (query or "").strip()
+        if not query:
+            return None
+        tokens = _index_tokens(query)
+        with self._lock:
+            if not tokens:
+                # Punctuation-only query: nothing to look up, scan the texts
+                return {i for i, doc in self._docs.items() if query in doc["text"]}
+            if self._vocab is None:
+                self._vocab = sorted(self._postings)
+                self._expansions = {}
+            result: set[int] | None = None
+            # Longer tokens occur in fewer words, so they shrink the result fastest
+            for token in sorted(set(tokens), key=len, reverse=True):
+                ids = self._substring_ids(token)
+                result = ids if result is None else result & ids
+                if not result:
+                    return set()
+            if len(tokens) == 1 and tokens[0] == query:
+                return result
+            return {i for i in result if query in self._docs[i]["text"]}
+
+    def _substring_ids(self, token: str) -> set[int]:
+        words = self._expansions.get(token)
+        if words is None:
+            words = [w for w in self._vocab if token in w]
+            if len(self._expansions) >= _EXPANSION_CACHE_MAX:
+                self._expansions.clear()
+            self._expansions[token] = words
+        ids: set[int] = set()
+        for word in words:
+            ids |= self._postings[word]
+        return ids
+
+    def facet(self, *names: str) -> set[int]:
+        """Union of the given facet sets."""
+        with self._lock:
+            out: set[int] = set()
+            for name in names:
+                out |= self._facets.get(name, set())
+            return out
+
+    def items(self, ids: set[int], limit: int) -> list[dict]:
+        """Postings for ``ids`` in feed order, capped at ``limit``."""
+        with self._lock:
+            ordered = sorted((self._positions[i], i) for i in ids if i in self._docs)
+            return [self._docs[i]["item"] for _, i in ordered[:limit]]
+
+    def stats(self) -> dict:
+        return {
+            "documents": len(self._docs),
+            "tokens": len(self._postings),
+            "facets": len(self._facets),
+        }
@@ -0,0 +1,97 @@
+"""Server-side ranking of the merged job search results.
+
+Each posting gets one score from four signals, all in ``[0, 1]``:
+
+- relevance: share of query tokens found (as word prefixes, like the local
+  index) in the title, with a smaller weight for the company;
+- recency: exponential decay of the posting age, measured against the newest
+  posting in the same result set rather than the wall clock;
+- salary: whether the posting states a salary;
+- popularity: the precomputed per-URL click score from the rollups.
+
+Scores only depend on the postings and the popularity map, and ties keep the
+merged (round-robin) order, so the same inputs always give the same order.
+"""
+import math
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from backend.job_index import tokenize
+
+WEIGHTS = {"relevance": 0.45, "recency": 0.25, "salary": 0.1, "popularity": 0.2}
+RECENCY_HALF_LIFE_DAYS = 7.0
+
+
+def parse_posted_at(value) -> str | None:
+    """Normalize a provider date (epoch, ISO 8601 or RFC 822) to ``YYYY-MM-DDTHH:MM:SSZ``."""
+    if value in (None, ""):
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            dt = datetime.fromtimestamp(float(value), tz=timezone.utc)
+        else:
+            text = str(value).strip()
+            if text.isdigit():
+                dt = datetime.fromtimestamp(int(text), tz=timezone.utc)
+            elif text[:4].isdigit():
+                dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+            else:
+                dt = parsedate_to_datetime(text)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _timestamp(item: dict) -> float | None:
+    posted = item.get("posted_at")
+    if not posted:
+        return None
+    try:
+        return datetime.strptime(posted, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+def _prefix_share(tokens: list[str], words: set[str]) -> float:
+    if not tokens or not words:
+        return 0.0
+    hits = sum(1 for t in tokens if t in words or any(w.startswith(t) for w in words))
+    return hits / len(tokens)
+
+
+def relevance(tokens: list[str], item: dict, normalize) -> float:
+    title = set(tokenize(normalize(item.get("title") or "")))
+    company = set(tokenize(normalize(item.get("company") or "")))
+    return min(1.0, _prefix_share(tokens, title) + 0.3 * _prefix_share(tokens, company))
+
+
+def rank(items: list, query: str, popularity: dict[str, float], normalize, sort: str | None = None) -> list:
+    """Return ``items`` ordered by ``sort`` ("date", "salary") or by the blended score."""
+    stamps = [_timestamp(it) for it in items]
+    if sort == "date":
+        order = sorted(range(len(items)), key=lambda i: (stamps[i] is None, -(stamps[i] or 0), i))
+        return [items[i] for i in order]
+    if sort == "salary":
+        def salary(i):
+            it = items[i]
+            value = it.get("salary_max") or it.get("salary_min")
+            return (value is None, -(value or 0), i)
+        return [items[i] for i in sorted(range(len(items)), key=salary)]
+
+    tokens = sorted(set(tokenize(normalize(query or ""))))
+    newest = max((s for s in stamps if s is not None), default=None)
+    half_life = RECENCY_HALF_LIFE_DAYS * 86400
+    scores = []
+    for i, it in enumerate(items):
+        score = WEIGHTS["relevance"] * (relevance(tokens, it, normalize) if tokens else 0.0)
+        if stamps[i] is not None and newest is not None:
+            score += WEIGHTS["recency"] * math.pow(0.5, (newest - stamps[i]) / half_life)
+        if it.get("salary_min") or it.get("salary_max"):
+            score += WEIGHTS["salary"]
+        score += WEIGHTS["popularity"] * popularity.get(it.get("url") or "", 0.0)
+        # Rounding keeps float noise from reordering equal scores
+        scores.append((-round(score, 6), i))
+    scores.sort()
+    return [items[i] for _, i in scores]
@@ -0,0 +1,118 @@
+"""In-process snapshots of the full-feed job providers.
+
+Remotive, Arbeitnow and RemoteOK only offer "download everything" endpoints, so
+instead of re-downloading the feed for every distinct search a background thread
+pulls each feed on a schedule, normalizes it once and keeps the records in
+memory. ``search_jobs`` filters the local snapshot and only falls back to the
+network when no usable snapshot exists yet.
+"""
+import os
+import time
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class FeedSnapshots:
+    """Registry of feed loaders plus the refresher thread that keeps them warm."""
+
+    def __init__(self):
+        self._loaders: dict[str, Callable[[], list]] = {}
+        self._snapshots: dict[str, dict] = {}
+        self._listeners: list[Callable[[str, list], None]] = []
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self.enabled = True
+        self.interval = 600.0
+        self.max_age = 3600.0
+
+    def init_app(self, app):
+        self.enabled = bool(app.config.get("JOBS_SNAPSHOT_ENABLED", True))
+        self.interval = float(app.config.get("JOBS_SNAPSHOT_INTERVAL", 600))
+        self.max_age = float(app.config.get("JOBS_SNAPSHOT_MAX_AGE", 3600))
+
+    def register(self, name: str, loader: Callable[[], list]) -> None:
+        """Register ``loader`` (returns the normalized records of one feed)."""
+        self._loaders[name] = loader
+
+    def add_listener(self, fn: Callable[[str, list], None]) -> None:
+        """Call ``fn(name, records)`` with every new feed snapshot, before it is published."""
+        self._listeners.append(fn)
+
+    def get(self, name: str) -> list | None:
+        """Return the current records for ``name`` or None if there is no fresh snapshot."""
+        if not self.enabled:
+            return None
+        self.ensure_started()
+        snap = self._snapshots.get(name)
+        if snap is None or time.time() - snap["fetched_at"] > self.max_age:
+            return None
+        return snap["records"]
+
+    def refresh(self, name: str) -> bool:
+        """Download and swap in a new snapshot; keep the old one on failure."""
+        loader = self._loaders[name]
+        started = time.monotonic()
+        try:
+            records = loader()
+        except Exception as e:
+            logger.warning("feed snapshot %s refresh failed: %s", name, e)
+            with self._lock:
+                if name in self._snapshots:
+                    self._snapshots[name]["errors"] += 1
+            return False
+        if records is None:
+            logger.warning("feed snapshot %s refresh got no data", name)
+            return False
+        # Derived structures (the search index) are updated first, so a reader
+        # never sees the new snapshot before they cover it
+        for fn in self._listeners:
+            try:
+                fn(name, records)
+            except Exception as e:
+                logger.exception("feed snapshot listener error: %s", e)
+        with self._lock:
+            self._snapshots[name] = {
+                "records": records,
+                "fetched_at": time.time(),
+                "duration": time.monotonic() - started,
+                "errors": 0,
+            }
+        logger.info("feed snapshot %s refreshed records=%s", name, len(records))
+        return True
+
+    def ensure_started(self) -> None:
+        """Start the refresher thread once per process (threads do not survive fork)."""
+        if not self.enabled or (self._thread is not None and self._pid == os.getpid()):
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="jobs-feed-snapshots", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            for name in list(self._loaders):
+                self.refresh(name)
+            time.sleep(self.interval)
+
+    def status(self) -> dict:
+        """Age and size of every snapshot, for the metrics endpoints."""
+        now = time.time()
+        return {
+            name: {
+                "records": len(snap["records"]),
+                "age_seconds": round(now - snap["fetched_at"], 1),
+                "refresh_seconds": round(snap["duration"], 3),
+                "errors_since_refresh": snap["errors"],
+            }
+            for name, snap in list(self._snapshots.items())
+        }
+
+
+feed_snapshots = FeedSnapshots()
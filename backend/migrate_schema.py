@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Script para actualizar el esquema de una base de datos existente.
+
+``db.create_all()`` crea las tablas nuevas pero no agrega columnas a tablas que
+ya existen. Este script agrega las columnas que faltan (de forma idempotente),
+convierte las columnas JSON guardadas como texto y crea los índices nuevos.
+Uso: ``python -m backend.migrate_schema``
+"""
+import json
+from sqlalchemy import inspect, text
+from backend.app import create_app
+from backend.extensions import db
+from backend.db_utils import coerce_list
+from backend.project_search import project_search
+
+# (tabla, columna, tipo SQL, sentencia de relleno opcional)
+COLUMNS = [
+    ("favorite_jobs", "updated_at", "TIMESTAMP", "UPDATE favorite_jobs SET updated_at = created_at WHERE updated_at IS NULL"),
+    ("favorite_jobs", "deleted_at", "TIMESTAMP", None),
+]
+
+# (tabla, columna) de texto con arrays JSON que pasan a JSON nativo (JSONB en
+# Postgres; SQLite no tiene tipo JSON y sigue guardando el texto, ya normalizado)
+JSON_COLUMNS = [
+    ("projects", "images"),
+    ("projects", "links"),
+]
+
+# (tabla, sentencia)
+INDEXES = [
+    ("favorite_jobs", "CREATE INDEX IF NOT EXISTS ix_fav_user_updated ON favorite_jobs (user_id, updated_at, id)"),
+    ("projects", "CREATE INDEX IF NOT EXISTS ix_projects_created_id ON projects (created_at, id)"),
+    ("projects", "CREATE INDEX IF NOT EXISTS ix_projects_category_created_id ON projects (category, created_at, id)"),
+]
+
+
+def _normalize_json_column(conn, table: str, column: str) -> int:
+    """Reescribe como array JSON los valores vacíos o en texto plano (líneas/comas)."""
+    fixed = 0
+    for row_id, value in conn.execute(text(f"SELECT id, {column} FROM {table}")).all():
+        try:
+            if isinstance(json.loads(value), list):
+                continue
+        except (TypeError, ValueError):
+            pass
+        conn.execute(
+            text(f"UPDATE {table} SET {column} = :value WHERE id = :id"),
+            {"value": json.dumps(coerce_list(value)), "id": row_id},
+        )
+        fixed += 1
+    return fixed
+
+
+def _convert_json_columns(conn, inspector, tables) -> None:
+    for table, column in JSON_COLUMNS:
+        if table not in tables:
+            continue
+        types = {c["name"]: str(c["type"]).upper() for c in inspector.get_columns(table)}
+        if column not in types or "JSON" in types[column]:
+            continue
+        fixed = _normalize_json_column(conn, table, column)
+        if fixed:
+            print(f"  - {table}.{column}: {fixed} valores convertidos a array JSON")
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT"))
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"
+            ))
+            print(f"  - Columna convertida a JSONB: {table}.{column}")
+
+
+def migrate() -> None:
+    inspector = inspect(db.engine)
+    tables = set(inspector.get_table_names())
+    with db.engine.begin() as conn:
+        for table, column, sql_type, backfill in COLUMNS:
+            if table not in tables:
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            if column in existing:
+                continue
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}"))
+            print(f"  - Columna agregada: {table}.{column}")
+            if backfill:
+                conn.execute(text(backfill))
+        _convert_json_columns(conn, inspector, tables)
+        for table, statement in INDEXES:
+            if table in tables:
+                conn.execute(text(statement))
+    # Tablas nuevas (rollups de clicks, etc.)
+    db.create_all()
+    # Índice de texto completo de proyectos (FTS5 / tsvector) y sus triggers
+    project_search.setup()
+
+
+if __name__ == "__main__":
+    app = create_app()
+    with app.app_context():
+        print("Actualizando esquema de la base de datos...")
+        migrate()
+        print("\n✅ Esquema actualizado")
@@ -1,5 +1,6 @@
 from datetime import datetime
 from backend.extensions import db
+from backend.db_utils import JSONList
 
 
 class User(db.Model):
@@ -30,13 +31,19 @@ class Project(db.Model):
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, default="")
     technologies = db.Column(db.String(512), default="")
-    images = db.Column(db.Text, default="")
-    links = db.Column(db.Text, default="")
+    # Arrays JSON nativos (JSONB en Postgres); la API sigue devolviendo strings JSON
+    images = db.Column(JSONList, default=list)
+    links = db.Column(JSONList, default=list)
     category = db.Column(db.String(128), default="general")
     featured = db.Column(db.Boolean, default=False)
     share_token = db.Column(db.String(32), unique=True, nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Keyset pagination of the explore feed, with and without a category filter
+    __table_args__ = (
+        db.Index("ix_projects_created_id", "created_at", "id"),
+        db.Index("ix_projects_category_created_id", "category", "created_at", "id"),
+    )
 
 
 class FavoriteJob(db.Model):
@@ -49,7 +56,13 @@ class FavoriteJob(db.Model):
     url = db.Column(db.String(512), nullable=False)
     source = db.Column(db.String(64), default="adzuna")
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    __table_args__ = (db.UniqueConstraint("user_id", "url", name="uq_fav_user_url"),)
+    # Delta sync: every change bumps updated_at; removals keep the row as a tombstone
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = db.Column(db.DateTime, nullable=True)
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "url", name="uq_fav_user_url"),
+        db.Index("ix_fav_user_updated", "user_id", "updated_at", "id"),
+    )
 
 
 class JobClick(db.Model):
@@ -62,3 +75,28 @@ class JobClick(db.Model):
     source = db.Column(db.String(64))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     __table_args__ = (db.Index("ix_job_clicks_url_created", "url", "created_at"),)
+
+
+class JobClickRollup(db.Model):
+    """Click counts per job posting and hour/day bucket, built from job_clicks."""
+    __tablename__ = "job_click_rollups"
+    id = db.Column(db.Integer, primary_key=True)
+    period = db.Column(db.String(8), nullable=False)  # "hour" | "day"
+    bucket_start = db.Column(db.DateTime, nullable=False)
+    url = db.Column(db.String(512), nullable=False)
+    source = db.Column(db.String(64), nullable=False, default="")
+    company = db.Column(db.String(255), nullable=False, default="")
+    title = db.Column(db.String(255), default="")
+    clicks = db.Column(db.Integer, nullable=False, default=0)
+    __table_args__ = (
+        db.UniqueConstraint("period", "bucket_start", "url", "source", "company", name="uq_click_rollup_bucket"),
+        db.Index("ix_click_rollups_period_bucket", "period", "bucket_start"),
+    )
+
+
+class RollupState(db.Model):
+    """High-water mark (last processed source row id) of an incremental rollup."""
+    __tablename__ = "rollup_state"
+    name = db.Column(db.String(64), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,343 @@
+"""Full-text search over projects (title, description, technologies).
+
+SQL backends keep the index inside the database, so every write path stays in
+sync without application hooks:
+
+- SQLite: an FTS5 table (``unicode61 remove_diacritics 2`` tokenizer) filled by
+  triggers on ``projects`` and ranked with ``bm25``, title weighted x10;
+- Postgres: a GIN expression index over a weighted ``tsvector`` (title "A",
+  description and technologies "B") built on an immutable ``unaccent`` wrapper,
+  ranked with ``ts_rank``.
+
+``setup()`` creates those objects (``python -m backend.migrate_schema`` or
+``AUTO_CREATE_DB``); until it has run, searches fall back to ``ILIKE``.
+
+In Firestore mode there is no server-side text search, so each worker keeps an
+inverted index of the ``projects`` collection. It is loaded once, updated by the
+create/update/delete routes and re-read every ``PROJECT_SEARCH_REFRESH`` seconds
+in the background to pick up writes made by other workers.
+"""
+import math
+import time
+import bisect
+import logging
+import threading
+import unicodedata
+from collections import defaultdict
+
+from sqlalchemy import text
+
+from backend.extensions import db
+from backend.job_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Field weights for the in-process index (mirrors the SQL A/B weights)
+FIELD_WEIGHTS = {"title": 3.0, "technologies": 2.0, "description": 1.0}
+
+_PG_VECTOR = (
+    "setweight(to_tsvector('simple', projects_search_unaccent(coalesce(title, ''))), 'A') || "
+    "setweight(to_tsvector('simple', projects_search_unaccent("
+    "coalesce(description, '') || ' ' || coalesce(technologies, ''))), 'B')"
+)
+
+_SQLITE_BODY = "coalesce({p}.description, '') || ' ' || coalesce({p}.technologies, '')"
+
+_SQLITE_SETUP = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5("
+    "title, body, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN "
+    "INSERT INTO projects_fts(rowid, title, body) VALUES "
+    f"(new.id, coalesce(new.title, ''), {_SQLITE_BODY.format(p='new')}); END",
+    "CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN "
+    "DELETE FROM projects_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE ON projects BEGIN "
+    "DELETE FROM projects_fts WHERE rowid = old.id; "
+    "INSERT INTO projects_fts(rowid, title, body) VALUES "
+    f"(new.id, coalesce(new.title, ''), {_SQLITE_BODY.format(p='new')}); END",
+    # Backfill rows written before the triggers existed
+    "INSERT INTO projects_fts(rowid, title, body) "
+    f"SELECT id, coalesce(title, ''), {_SQLITE_BODY.format(p='projects')} FROM projects "
+    "WHERE id NOT IN (SELECT rowid FROM projects_fts)",
+]
+
+
+def fold(value: str) -> str:
+    """Lower-case and strip accents, the normalization used on both sides of a search."""
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKD", str(value))
+    return "".join(c for c in value if not unicodedata.combining(c)).lower()
+
+
+def query_tokens(term: str) -> list[str]:
+    return tokenize(fold(term))[:10]
+
+
+class ProjectDocumentIndex:
+    """Inverted index over Firestore project documents, ranked with a weighted TF-IDF."""
+
+    def __init__(self):
+        self._docs: dict[str, dict] = {}
+        self._terms: dict[str, dict[str, float]] = {}
+        self._postings: dict[str, set[str]] = defaultdict(set)
+        self._vocab: list[str] | None = None
+        self._lock = threading.RLock()
+
+    def replace_all(self, docs: list[dict]) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._terms.clear()
+            self._postings.clear()
+            self._vocab = None
+            for doc in docs:
+                self._add(str(doc.get("id")), doc)
+
+    def upsert(self, doc_id: str, fields: dict) -> None:
+        """Index a new document or merge updated fields into an indexed one."""
+        with self._lock:
+            doc = {**self._docs.get(doc_id, {}), **fields, "id": doc_id}
+            self._remove(doc_id)
+            self._add(doc_id, doc)
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def _add(self, doc_id: str, doc: dict) -> None:
+        weights: dict[str, float] = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(fold(doc.get(field) or "")):
+                weights[token] += weight
+        self._docs[doc_id] = doc
+        self._terms[doc_id] = dict(weights)
+        for token in weights:
+            if token not in self._postings:
+                self._vocab = None
+            self._postings[token].add(doc_id)
+
+    def _remove(self, doc_id: str) -> None:
+        self._docs.pop(doc_id, None)
+        for token in self._terms.pop(doc_id, {}):
+            ids = self._postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(doc_id)
+            if not ids:
+                del self._postings[token]
+                self._vocab = None
+
+    def _expand(self, token: str) -> list[str]:
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        vocab = self._vocab
+        out = []
+        for i in range(bisect.bisect_left(vocab, token), len(vocab)):
+            if not vocab[i].startswith(token):
+                break
+            out.append(vocab[i])
+        return out
+
+    def search(self, term: str, category: str | None = None) -> list[dict]:
+        """Documents matching every query token (as a word prefix), best first."""
+        tokens = query_tokens(term)
+        if not tokens:
+            return []
+        with self._lock:
+            n_docs = max(len(self._docs), 1)
+            scores: dict[str, float] | None = None
+            for token in tokens:
+                token_scores: dict[str, float] = defaultdict(float)
+                for word in self._expand(token):
+                    ids = self._postings[word]
+                    idf = math.log(1 + n_docs / len(ids))
+                    for doc_id in ids:
+                        token_scores[doc_id] = max(token_scores[doc_id], self._terms[doc_id][word] * idf)
+                if scores is None:
+                    scores = dict(token_scores)
+                else:
+                    scores = {d: s + token_scores[d] for d, s in scores.items() if d in token_scores}
+                if not scores:
+                    return []
+            docs = [
+                (score, self._docs[doc_id]) for doc_id, score in scores.items()
+                if not category or self._docs[doc_id].get("category") == category
+            ]
+        # Deterministic: score, then newest, then id
+        docs.sort(key=lambda sd: (-round(sd[0], 6), -_ts(sd[1].get("created_at")), str(sd[1].get("id"))))
+        return [dict(doc) for _, doc in docs]
+
+    def filter(self, term: str, category: str | None = None, descending: bool = True) -> list[dict]:
+        """Documents whose title or description contains ``term`` (case-insensitive),
+        by creation date. For queries without indexable words."""
+        needle = term.lower()
+        with self._lock:
+            docs = [
+                doc for doc in self._docs.values()
+                if (not category or doc.get("category") == category)
+                and (needle in (doc.get("title") or "").lower() or needle in (doc.get("description") or "").lower())
+            ]
+        docs.sort(key=lambda d: (_ts(d.get("created_at")), str(d.get("id"))), reverse=descending)
+        return [dict(doc) for doc in docs]
+
+
+def _ts(value) -> float:
+    try:
+        return value.timestamp()
+    except (AttributeError, ValueError, OverflowError, OSError):
+        return 0.0
+
+
+class ProjectSearch:
+    """Entry point used by the project routes for both storage backends."""
+
+    def __init__(self):
+        self.refresh_interval = 300.0
+        self._documents = ProjectDocumentIndex()
+        self._loaded_at = 0.0
+        self._loading = threading.Lock()
+        self._refreshing = False
+        self._sql_backend: str | None = None
+
+    def init_app(self, app):
+        self.refresh_interval = float(app.config.get("PROJECT_SEARCH_REFRESH", self.refresh_interval))
+
+    # ----- SQL -----
+
+    def setup(self) -> str | None:
+        """Create the database-side search index; returns the backend name or None."""
+        dialect = db.engine.dialect.name
+        try:
+            with db.engine.begin() as conn:
+                if dialect == "sqlite":
+                    for statement in _SQLITE_SETUP:
+                        conn.execute(text(statement))
+                elif dialect == "postgresql":
+                    self._setup_postgres(conn)
+                else:
+                    return None
+        except Exception as e:
+            logger.warning("project search index setup failed (%s): %s", dialect, e)
+            return None
+        self._sql_backend = None  # re-detect on next search
+        return dialect
+
+    def _setup_postgres(self, conn) -> None:
+        try:
+            with conn.begin_nested():
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+                body = "SELECT public.unaccent('public.unaccent'::regdictionary, $1)"
+                conn.execute(text(
+                    "CREATE OR REPLACE FUNCTION projects_search_unaccent(text) RETURNS text "
+                    f"LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS $$ {body} $$"
+                ))
+        except Exception as e:
+            # Without the extension stored text is not accent-folded; queries still are
+            logger.warning("unaccent extension unavailable, project search will not fold accents: %s", e)
+            conn.execute(text(
+                "CREATE OR REPLACE FUNCTION projects_search_unaccent(text) RETURNS text "
+                "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS $$ SELECT $1 $$"
+            ))
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_projects_search ON projects USING GIN (({_PG_VECTOR}))"))
+
+    def sql_backend(self) -> str:
+        """``sqlite``, ``postgresql`` or ``like`` (no full-text index set up yet)."""
+        if self._sql_backend is None:
+            dialect = db.engine.dialect.name
+            backend = "like"
+            try:
+                if dialect == "sqlite":
+                    found = db.session.execute(text(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'"
+                    )).first()
+                    backend = "sqlite" if found else "like"
+                elif dialect == "postgresql":
+                    found = db.session.execute(text(
+                        "SELECT 1 FROM pg_indexes WHERE indexname = 'ix_projects_search'"
+                    )).first()
+                    backend = "postgresql" if found else "like"
+            except Exception as e:
+                logger.warning("project search backend detection failed: %s", e)
+            self._sql_backend = backend
+        return self._sql_backend
+
+    def search_ids(self, term: str, category: str | None, limit: int, offset: int) -> tuple[list[int], int] | None:
+        """Ranked project ids for ``term`` plus the match count, or None to fall back to ILIKE."""
+        tokens = query_tokens(term)
+        backend = self.sql_backend()
+        if not tokens or backend == "like":
+            return None
+        params = {"limit": limit, "offset": offset}
+        cat_sql = ""
+        if category:
+            cat_sql = " AND p.category = :category"
+            params["category"] = category
+        if backend == "sqlite":
+            params["q"] = " ".join(f'"{t}"*' for t in tokens)
+            base = "FROM projects_fts JOIN projects p ON p.id = projects_fts.rowid WHERE projects_fts MATCH :q" + cat_sql
+            ids_sql = (
+                f"SELECT p.id {base} ORDER BY bm25(projects_fts, 10.0, 1.0), p.created_at DESC, p.id DESC "
+                "LIMIT :limit OFFSET :offset"
+            )
+        else:
+            params["q"] = " & ".join(f"{t}:*" for t in tokens)
+            base = f"FROM projects p WHERE ({_PG_VECTOR}) @@ to_tsquery('simple', :q)" + cat_sql
+            ids_sql = (
+                f"SELECT p.id {base} ORDER BY ts_rank(({_PG_VECTOR}), to_tsquery('simple', :q)) DESC, "
+                "p.created_at DESC, p.id DESC LIMIT :limit OFFSET :offset"
+            )
+        ids = [row[0] for row in db.session.execute(text(ids_sql), params)]
+        total = db.session.execute(text(f"SELECT count(*) {base}"), params).scalar() or 0
+        return ids, int(total)
+
+    # ----- Firestore -----
+
+    def search_documents(self, term: str, category: str | None = None) -> list[dict]:
+        """Ranked Firestore project documents matching ``term``."""
+        self._ensure_documents()
+        return self._documents.search(term, category)
+
+    def filter_documents(self, term: str, category: str | None = None, descending: bool = True) -> list[dict]:
+        """Firestore project documents containing ``term`` as a substring, newest first by default."""
+        self._ensure_documents()
+        return self._documents.filter(term, category, descending)
+
+    def _ensure_documents(self) -> None:
+        if not self._loaded_at:
+            with self._loading:
+                if not self._loaded_at:
+                    self._load_documents()
+            return
+        if time.time() - self._loaded_at > self.refresh_interval and not self._refreshing:
+            self._refreshing = True
+            threading.Thread(target=self._refresh_documents, name="project-search-refresh", daemon=True).start()
+
+    def _load_documents(self) -> None:
+        from backend.firebase_service import firebase_service
+
+        started = time.monotonic()
+        docs = firebase_service.get_all_projects()
+        self._documents.replace_all(docs)
+        self._loaded_at = time.time()
+        logger.info("project search index loaded docs=%s in %.2fs", len(docs), time.monotonic() - started)
+
+    def _refresh_documents(self) -> None:
+        try:
+            with self._loading:
+                self._load_documents()
+        except Exception as e:
+            logger.warning("project search index refresh failed: %s", e)
+        finally:
+            self._refreshing = False
+
+    def document_saved(self, doc_id: str, fields: dict) -> None:
+        """Keep the local index in step with a Firestore create/update."""
+        if self._loaded_at:
+            self._documents.upsert(str(doc_id), fields)
+
+    def document_deleted(self, doc_id: str) -> None:
+        if self._loaded_at:
+            self._documents.remove(str(doc_id))
+
+
+project_search = ProjectSearch()
@@ -0,0 +1,172 @@
+"""Health tracking, circuit breaking and adaptive timeouts for job providers.
+
+Each provider keeps a short window of call latencies and a count of consecutive
+failures. After ``JOBS_BREAKER_FAILURES`` failures in a row the breaker opens
+and the provider is skipped for a cool-down that doubles on every re-trip (up
+to ``JOBS_BREAKER_MAX_COOLDOWN``). When the cool-down ends one trial call is let
+through (half-open); its outcome closes or re-opens the breaker. While closed,
+the per-call timeout follows the observed p95 latency instead of a fixed 10s.
+"""
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderUnavailable(Exception):
+    """Raised instead of calling a provider whose breaker is open."""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider} circuit open, retry in {retry_in:.0f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+class _State:
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.trial_in_flight = False
+        self.latencies: deque[float] = deque(maxlen=50)
+        self.calls = 0
+        self.errors = 0
+        self.skipped = 0
+        self.last_error: str | None = None
+
+
+class ProviderHealthRegistry:
+    """Per-provider breaker state shared by every request thread of the worker."""
+
+    def __init__(self):
+        self._states: dict[str, _State] = {}
+        self._lock = threading.Lock()
+        self.failure_threshold = 3
+        self.base_cooldown = 30.0
+        self.max_cooldown = 600.0
+        self.min_timeout = 2.0
+        self.max_timeout = 10.0
+        self.timeout_factor = 3.0
+
+    def init_app(self, app):
+        self.failure_threshold = max(1, int(app.config.get("JOBS_BREAKER_FAILURES", self.failure_threshold)))
+        self.base_cooldown = float(app.config.get("JOBS_BREAKER_COOLDOWN", self.base_cooldown))
+        self.max_cooldown = float(app.config.get("JOBS_BREAKER_MAX_COOLDOWN", self.max_cooldown))
+        self.min_timeout = float(app.config.get("JOBS_TIMEOUT_MIN", self.min_timeout))
+        self.max_timeout = float(app.config.get("JOBS_HTTP_TIMEOUT", self.max_timeout))
+        self.timeout_factor = float(app.config.get("JOBS_TIMEOUT_FACTOR", self.timeout_factor))
+
+    def _get(self, provider: str) -> _State:
+        st = self._states.get(provider)
+        if st is None:
+            with self._lock:
+                st = self._states.setdefault(provider, _State())
+        return st
+
+    def before_call(self, provider: str) -> float:
+        """Admit a call and return its timeout, or raise ProviderUnavailable."""
+        return self._admit(provider)[0]
+
+    @contextmanager
+    def call(self, provider: str):
+        """``before_call`` as a block yielding the timeout.
+
+        A half-open trial that leaves the block without a recorded outcome (an
+        error other than the HTTP failures the caller records) is released on
+        exit, so the next call probes again instead of the provider staying
+        skipped for good.
+        """
+        timeout, trial = self._admit(provider)
+        try:
+            yield timeout
+        finally:
+            if trial:
+                st = self._get(provider)
+                with self._lock:
+                    st.trial_in_flight = False
+
+    def _admit(self, provider: str) -> tuple[float, bool]:
+        st = self._get(provider)
+        now = time.monotonic()
+        with self._lock:
+            if st.state == OPEN:
+                if now < st.open_until:
+                    st.skipped += 1
+                    raise ProviderUnavailable(provider, st.open_until - now)
+                st.state = HALF_OPEN
+                st.trial_in_flight = False
+            if st.state == HALF_OPEN:
+                if st.trial_in_flight:
+                    st.skipped += 1
+                    raise ProviderUnavailable(provider, 0)
+                st.trial_in_flight = True
+            st.calls += 1
+            return self._timeout(st), st.state == HALF_OPEN
+
+    def _timeout(self, st: _State) -> float:
+        if st.state == HALF_OPEN or len(st.latencies) < 5:
+            return self.max_timeout
+        p95 = _percentile(list(st.latencies), 95)
+        return max(self.min_timeout, min(self.max_timeout, p95 * self.timeout_factor))
+
+    def record_success(self, provider: str, latency: float) -> None:
+        st = self._get(provider)
+        with self._lock:
+            st.latencies.append(latency)
+            st.failures = 0
+            st.trips = 0
+            st.state = CLOSED
+            st.trial_in_flight = False
+
+    def record_failure(self, provider: str, latency: float, error: str) -> None:
+        st = self._get(provider)
+        with self._lock:
+            st.latencies.append(latency)
+            st.errors += 1
+            st.failures += 1
+            st.last_error = error[:200]
+            st.trial_in_flight = False
+            if st.state == HALF_OPEN or st.failures >= self.failure_threshold:
+                st.trips += 1
+                cooldown = min(self.max_cooldown, self.base_cooldown * (2 ** (st.trips - 1)))
+                st.state = OPEN
+                st.open_until = time.monotonic() + cooldown
+
+    def snapshot(self) -> dict:
+        """Current breaker state and latency percentiles per provider."""
+        now = time.monotonic()
+        out = {}
+        with self._lock:
+            for name, st in self._states.items():
+                lat = list(st.latencies)
+                p50 = _percentile(lat, 50)
+                p95 = _percentile(lat, 95)
+                out[name] = {
+                    "state": st.state,
+                    "consecutive_failures": st.failures,
+                    "retry_in_seconds": round(max(0.0, st.open_until - now), 1) if st.state == OPEN else 0,
+                    "timeout_seconds": round(self._timeout(st), 2),
+                    "latency_p50_ms": round(p50 * 1000) if p50 is not None else None,
+                    "latency_p95_ms": round(p95 * 1000) if p95 is not None else None,
+                    "calls": st.calls,
+                    "errors": st.errors,
+                    "skipped": st.skipped,
+                    "last_error": st.last_error,
+                }
+        return out
+
+
+provider_health = ProviderHealthRegistry()
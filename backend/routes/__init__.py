@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.extensions import limiter, db
 from backend.models import User
 from backend.firebase_service import firebase_service
+from .conditional import make_etag, not_modified, conditional
 
 users_bp = Blueprint("users", __name__)
 
@@ -21,12 +22,21 @@ def get_my_profile():
         user_data = firebase_service.get_user(user_id)
         if not user_data:
             return jsonify({"error": "User not found"}), 404
-        return jsonify(_firebase_user_to_dict(user_data))
+        modified = user_data.get("updated_at")
+        etag = make_etag("me", user_id, modified)
+        cached = not_modified(etag, modified, private=True)
+        if cached:
+            return cached
+        return conditional(jsonify(_firebase_user_to_dict(user_data)), etag, modified, private=True)
     else:
         # Local: usar SQL
         user_id = int(user_id)
         user = User.query.get_or_404(user_id)
-        return jsonify(_user_to_dict(user))
+        etag = make_etag("me", user.id, user.updated_at, user.portfolio_share_token)
+        cached = not_modified(etag, user.updated_at, private=True)
+        if cached:
+            return cached
+        return conditional(jsonify(_user_to_dict(user)), etag, user.updated_at, private=True)
 
 
 @users_bp.put("/me")
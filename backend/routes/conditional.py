@@ -0,0 +1,57 @@
+"""Conditional GET helpers.
+
+Validators are built from cheap metadata (``updated_at``, row counts, ids) so an
+unchanged resource answers ``304 Not Modified`` before it is serialized.
+"""
+import hashlib
+from datetime import datetime, timezone
+from flask import request, make_response, current_app
+
+
+def make_etag(*parts) -> str:
+    """Stable validator for the given parts (datetimes, ids, counts, filters)."""
+    raw = "|".join(p.isoformat() if isinstance(p, datetime) else str(p) for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def _http_date(value: datetime | None) -> datetime | None:
+    if not isinstance(value, datetime):
+        return None
+    # Stored timestamps are naive UTC; HTTP dates have one-second precision
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def _with_validators(resp, etag: str, last_modified: datetime | None, private: bool):
+    resp.set_etag(etag)
+    if last_modified is not None:
+        resp.last_modified = last_modified
+    resp.cache_control.no_cache = True
+    if private:
+        resp.cache_control.private = True
+    else:
+        resp.cache_control.public = True
+    return resp
+
+
+def not_modified(etag: str, last_modified: datetime | None = None, private: bool = False):
+    """A 304 response when the request's validators still match, otherwise None.
+
+    ``If-None-Match`` takes precedence over ``If-Modified-Since`` (RFC 9110).
+    """
+    last_modified = _http_date(last_modified)
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified is not None:
+        fresh = last_modified <= request.if_modified_since
+    else:
+        fresh = False
+    if not fresh:
+        return None
+    return _with_validators(current_app.response_class(status=304), etag, last_modified, private)
+
+
+def conditional(rv, etag: str, last_modified: datetime | None = None, private: bool = False):
+    """Attach ``ETag``/``Last-Modified`` (and revalidation Cache-Control) to a response."""
+    return _with_validators(make_response(rv), etag, _http_date(last_modified), private)
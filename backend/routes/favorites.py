@@ -1,28 +1,126 @@
-from flask import Blueprint, request, jsonify
+import base64
+from datetime import datetime, timedelta
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import and_, case, or_
 from backend.extensions import db, limiter
 from backend.models import FavoriteJob
+from backend.db_utils import dialect_insert
 
 favorites_bp = Blueprint("favorites", __name__)
 
+MAX_BULK_OPS = 500
+SYNC_PAGE_DEFAULT = 500
+SYNC_PAGE_MAX = 1000
+
+
+def _serialize(f: FavoriteJob) -> dict:
+    return {
+        "id": f.id,
+        "title": f.title,
+        "company": f.company,
+        "location": f.location,
+        "url": f.url,
+        "source": f.source,
+    }
+
+
+def _encode_sync_cursor(updated_at: datetime, fav_id: int) -> str:
+    raw = f"{updated_at.isoformat()}|{fav_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_sync_cursor(cursor: str) -> tuple[datetime, int] | None:
+    """``(updated_at, id)`` position of a sync cursor; None means "from the beginning"."""
+    if cursor in ("", "0"):
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        stamp, fav_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(stamp), int(fav_id)
+    except Exception:
+        raise ValueError("invalid cursor")
+
+
+def _tombstone_horizon(now: datetime) -> datetime | None:
+    """Oldest ``deleted_at`` still kept; None when tombstones are kept forever."""
+    days = int(current_app.config.get("FAVORITES_TOMBSTONE_DAYS", 30))
+    return now - timedelta(days=days) if days > 0 else None
+
+
+def _prune_tombstones(user_id: int, now: datetime) -> None:
+    """Drop this user's removals that are older than the retention window."""
+    horizon = _tombstone_horizon(now)
+    if horizon is None:
+        return
+    FavoriteJob.query.filter(
+        FavoriteJob.user_id == user_id,
+        FavoriteJob.deleted_at.is_not(None),
+        FavoriteJob.deleted_at < horizon,
+    ).delete(synchronize_session=False)
+
+
+def _changes_since(user_id: int, cursor: str):
+    """Favorites added, changed or removed after ``cursor``, oldest change first.
+
+    Ordered by ``(updated_at, id)`` so the cursor is a keyset position served by
+    ``ix_fav_user_updated``. Removed favorites come back as ``deleted: true``.
+    Tombstones are pruned after ``FAVORITES_TOMBSTONE_DAYS``, so a cursor older
+    than that answers 410 and the client has to sync again from ``since=0``.
+
+    ``updated_at`` is stamped when the request starts, so a write can commit
+    after a later-stamped one has already been read. The last page's cursor is
+    therefore held back to ``FAVORITES_SYNC_LAG`` seconds ago: changes younger
+    than the lag are sent again on the next sync (clients apply them by url, so
+    repeats are harmless) instead of being skipped.
+    """
+    try:
+        position = _decode_sync_cursor(cursor)
+        limit = min(max(int(request.args.get("limit", SYNC_PAGE_DEFAULT)), 1), SYNC_PAGE_MAX)
+    except ValueError as e:
+        return jsonify({"error": str(e) or "invalid sync parameters"}), 400
+    now = datetime.utcnow()
+    horizon = _tombstone_horizon(now)
+    if position is not None and horizon is not None and position[0] < horizon:
+        return jsonify({"error": "cursor expired, sync again with since=0"}), 410
+    query = FavoriteJob.query.filter(FavoriteJob.user_id == user_id)
+    if position is not None:
+        stamp, fav_id = position
+        query = query.filter(or_(
+            FavoriteJob.updated_at > stamp,
+            and_(FavoriteJob.updated_at == stamp, FavoriteJob.id > fav_id),
+        ))
+    rows = query.order_by(FavoriteJob.updated_at, FavoriteJob.id).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changes = [
+        {
+            **_serialize(f),
+            "deleted": f.deleted_at is not None,
+            "updated_at": f.updated_at.isoformat() + "Z",
+        }
+        for f in rows
+    ]
+    next_cursor = _encode_sync_cursor(rows[-1].updated_at, rows[-1].id) if rows else (cursor or "0")
+    settled = now - timedelta(seconds=float(current_app.config.get("FAVORITES_SYNC_LAG", 5)))
+    if rows and not has_more and rows[-1].updated_at > settled:
+        next_cursor = _encode_sync_cursor(settled, 0)
+    return jsonify({"changes": changes, "cursor": next_cursor, "has_more": has_more})
+
 
 @favorites_bp.get("/jobs")
 @jwt_required()
 @limiter.limit("120/minute")
 def list_jobs():
     user_id = int(get_jwt_identity())
-    items = FavoriteJob.query.filter_by(user_id=user_id).order_by(FavoriteJob.created_at.desc()).all()
-    return jsonify([
-        {
-            "id": f.id,
-            "title": f.title,
-            "company": f.company,
-            "location": f.location,
-            "url": f.url,
-            "source": f.source,
-        }
-        for f in items
-    ])
+    if "since" in request.args:
+        return _changes_since(user_id, (request.args.get("since") or "").strip())
+    items = (
+        FavoriteJob.query.filter_by(user_id=user_id, deleted_at=None)
+        .order_by(FavoriteJob.created_at.desc())
+        .all()
+    )
+    return jsonify([_serialize(f) for f in items])
 
 
 @favorites_bp.post("/jobs")
@@ -37,8 +135,20 @@ def add_job():
     if not title or not company or not url:
         return jsonify({"error": "title, company, url required"}), 400
     existing = FavoriteJob.query.filter_by(user_id=user_id, url=url).first()
-    if existing:
+    if existing and existing.deleted_at is None:
         return jsonify({"ok": True, "id": existing.id})
+    if existing:
+        # Revive the tombstone so sync clients see the favorite come back
+        now = datetime.utcnow()
+        existing.title = title
+        existing.company = company
+        existing.location = data.get("location") or ""
+        existing.source = data.get("source") or "adzuna"
+        existing.created_at = now
+        existing.updated_at = now
+        existing.deleted_at = None
+        db.session.commit()
+        return jsonify({"ok": True, "id": existing.id}), 201
     fav = FavoriteJob(
         user_id=user_id,
         title=title,
@@ -52,6 +162,121 @@ def add_job():
     return jsonify({"ok": True, "id": fav.id}), 201
 
 
+def _bulk_rows(user_id: int, adds: list, now: datetime) -> dict[str, dict]:
+    rows: dict[str, dict] = {}
+    for entry in adds:
+        if not isinstance(entry, dict):
+            raise ValueError("add entries must be objects")
+        title = (entry.get("title") or "").strip()
+        company = (entry.get("company") or "").strip()
+        url = (entry.get("url") or "").strip()
+        if not title or not company or not url:
+            raise ValueError("title, company, url required for every add")
+        rows[url] = {
+            "user_id": user_id,
+            "title": title,
+            "company": company,
+            "location": entry.get("location") or "",
+            "url": url,
+            "source": entry.get("source") or "adzuna",
+            "created_at": now,
+            "updated_at": now,
+            "deleted_at": None,
+        }
+    return rows
+
+
+def _remove_urls(removes: list) -> set[str]:
+    urls: set[str] = set()
+    for entry in removes:
+        url = entry.get("url") if isinstance(entry, dict) else entry
+        if not isinstance(url, str):
+            raise ValueError("remove entries must be urls or objects with a url")
+        url = url.strip()
+        if not url:
+            raise ValueError("url required for every remove")
+        urls.add(url)
+    return urls
+
+
+def _upsert_favorites(rows: list[dict]) -> None:
+    insert = dialect_insert()
+    if insert is not None:
+        stmt = insert(FavoriteJob)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "url"],
+            set_={
+                "title": stmt.excluded.title,
+                "company": stmt.excluded.company,
+                "location": stmt.excluded.location,
+                "source": stmt.excluded.source,
+                # A revived tombstone counts as newly added
+                "created_at": case(
+                    (FavoriteJob.deleted_at.is_not(None), stmt.excluded.created_at),
+                    else_=FavoriteJob.created_at,
+                ),
+                "updated_at": stmt.excluded.updated_at,
+                "deleted_at": None,
+            },
+        )
+        db.session.execute(stmt, rows)
+        return
+    for row in rows:
+        fav = FavoriteJob.query.filter_by(user_id=row["user_id"], url=row["url"]).first()
+        if fav is None:
+            db.session.add(FavoriteJob(**row))
+            continue
+        if fav.deleted_at is not None:
+            fav.created_at = row["created_at"]
+        for field in ("title", "company", "location", "source", "updated_at", "deleted_at"):
+            setattr(fav, field, row[field])
+
+
+@favorites_bp.patch("/jobs")
+@jwt_required()
+@limiter.limit("30/minute")
+def patch_jobs():
+    """Apply ``{"add": [{title, company, url, ...}], "remove": [url, ...]}`` in one transaction."""
+    user_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "body must be a JSON object"}), 400
+    adds = data.get("add") or []
+    removes = data.get("remove") or []
+    if not isinstance(adds, list) or not isinstance(removes, list):
+        return jsonify({"error": "add and remove must be lists"}), 400
+    if len(adds) + len(removes) > MAX_BULK_OPS:
+        return jsonify({"error": f"at most {MAX_BULK_OPS} operations per request"}), 400
+    now = datetime.utcnow()
+    try:
+        rows = _bulk_rows(user_id, adds, now)
+        remove_urls = _remove_urls(removes)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if remove_urls & rows.keys():
+        return jsonify({"error": "a url cannot be both added and removed"}), 400
+
+    removed = 0
+    try:
+        if rows:
+            _upsert_favorites(list(rows.values()))
+        if remove_urls:
+            removed = (
+                FavoriteJob.query.filter(
+                    FavoriteJob.user_id == user_id,
+                    FavoriteJob.url.in_(remove_urls),
+                    FavoriteJob.deleted_at.is_(None),
+                )
+                .update({"deleted_at": now, "updated_at": now}, synchronize_session=False)
+            )
+            _prune_tombstones(user_id, now)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return jsonify({"ok": True, "added": len(rows), "removed": removed})
+
+
 @favorites_bp.delete("/jobs")
 @jwt_required()
 @limiter.limit("60/minute")
@@ -60,7 +285,10 @@ def remove_job():
     url = (request.args.get("url") or "").strip()
     if not url:
         return jsonify({"error": "url required"}), 400
-    FavoriteJob.query.filter_by(user_id=user_id, url=url).delete()
+    now = datetime.utcnow()
+    FavoriteJob.query.filter_by(user_id=user_id, url=url, deleted_at=None).update(
+        {"deleted_at": now, "updated_at": now}, synchronize_session=False
+    )
+    _prune_tombstones(user_id, now)
     db.session.commit()
     return jsonify({"ok": True})
-
@@ -1,15 +1,51 @@
 import os
+import hmac
+import json
+import time
+import base64
+import hashlib
 import logging
-from flask import Blueprint, request, jsonify
+import threading
+from itertools import zip_longest
+from typing import Iterable
+from contextlib import closing, contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from flask import Blueprint, Response, request, jsonify, current_app
 from backend.extensions import cache, limiter, db
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request, exceptions as jwt_ex
+from jwt.exceptions import PyJWTError
 import httpx
-from backend.models import JobClick
+from backend.models import FavoriteJob
+from backend.http_clients import provider_client
+from backend.provider_health import provider_health, ProviderUnavailable
+from backend.job_snapshots import feed_snapshots
+from backend.click_buffer import click_buffer
+from backend.click_rollups import click_rollups
+from backend.swr_cache import StaleWhileRevalidateCache
+from backend.job_dedup import NearDuplicateIndex, collapse_near_duplicates, richness
+from backend.job_index import PostingIndex
+from backend.job_ranking import rank, parse_posted_at
 import unicodedata
 import xml.etree.ElementTree as ET
 
+try:
+    import ijson  # incremental JSON decoding of the full-feed providers
+except ImportError:
+    ijson = None
+
 jobs_bp = Blueprint("jobs", __name__)
 logger = logging.getLogger(__name__)
+_search_cache = StaleWhileRevalidateCache(cache, "jobs:search")
+_executor: ThreadPoolExecutor | None = None
+_executor_pid: int | None = None
+_executor_lock = threading.Lock()
+
+
+@jobs_bp.record_once
+def _init_search_cache(state):
+    _search_cache.init_app(state.app, "JOBS_CACHE")
+
+
 def _normalize_text(value: str) -> str:
     if not value:
         return ""
@@ -18,118 +54,468 @@ def _normalize_text(value: str) -> str:
     return text.lower().strip()
 
 
+# Adzuna supported countries
+ADZUNA_SUPPORTED = {"mx", "us", "gb", "es", "br", "de", "fr", "it", "nl", "pl", "au", "ca", "at", "ch", "in", "nz", "sg", "za", "be"}
 
-@jobs_bp.get("/search")
-@limiter.limit("60/minute")
-@cache.cached(timeout=300, query_string=True)
-def search_jobs():
-    query = (request.args.get("q") or "").strip()
-    location = (request.args.get("location") or "").strip()
-    remote = request.args.get("remote")
-    min_salary = request.args.get("min_salary")
-    max_salary = request.args.get("max_salary")
-    page = int(request.args.get("page", 1))
-    per_page = int(request.args.get("per_page", 20))
-    country_raw = (request.args.get("country") or "").lower().strip()
+
+def _clean_int(value: str | None) -> str | None:
+    try:
+        return str(int(str(value).strip())) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+def _search_params(args) -> dict:
+    """Canonical provider-level parameters of a jobs search.
+
+    Case, whitespace, parameter order and invalid values no longer produce
+    distinct searches, and paging/presentation options are left out so every
+    view of the same search shares one cached result set.
+    """
+    remote = (args.get("remote") or "").lower().strip()
+    contract_time = args.get("contract_time")
+    contract_type = args.get("contract_type")
+    sort_by = args.get("sort")  # relevance|date|salary
+    country = (args.get("country") or "").lower().strip()
+    try:
+        source_limit = max(1, min(int(args.get("source_limit", 150)), 300))
+    except ValueError:
+        source_limit = 150
+    return {
+        "q": " ".join((args.get("q") or "").split()).lower(),
+        "location": " ".join((args.get("location") or "").split()).lower(),
+        "remote": remote if remote in {"true", "false"} else None,
+        "min_salary": _clean_int(args.get("min_salary")),
+        "max_salary": _clean_int(args.get("max_salary")),
+        "country": country or "global",
+        "contract_time": contract_time if contract_time in {"full_time", "part_time"} else None,
+        "contract_type": contract_type if contract_type in {"permanent", "contract"} else None,
+        "distance": _clean_int(args.get("distance_km")),
+        "max_days_old": _clean_int(args.get("max_days_old")),
+        "sort": sort_by if sort_by in {"relevance", "date", "salary"} else None,
+        "source_limit": source_limit,
+    }
+
+
+def _search_key(params: dict) -> str:
+    return hashlib.md5(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _provider_tasks(params: dict) -> list:
+    """Expand canonical search parameters into ``(provider, fetch, kwargs)`` tasks."""
+    country_raw = params["country"]
     shortlist = {"pa", "co", "mx"}
-    # Adzuna supported countries
-    ADZUNA_SUPPORTED = {"mx", "us", "gb", "es", "br", "de", "fr", "it", "nl", "pl", "au", "ca", "at", "ch", "in", "nz", "sg", "za", "be"}
     # Build fan-out list but keep only supported by Adzuna
-    if not country_raw or country_raw == "global":
+    if country_raw == "global":
         candidates = ["pa", "co", "mx"]
     else:
         candidates = [country_raw]
     adzuna_countries = [c for c in candidates if c in ADZUNA_SUPPORTED]
-    contract_time = request.args.get("contract_time")
-    contract_type = request.args.get("contract_type")
-    distance = request.args.get("distance_km")
-    max_days_old = request.args.get("max_days_old")
-    sort_by = request.args.get("sort")  # relevance|date|salary
-    with_meta = (request.args.get("with_meta") or "false").lower() == "true"
 
     # Provider selection:
     # - If a specific country was selected and is supported by Adzuna, use Adzuna + Indeed RSS (for LATAM: mx/co/pa)
     # - If country is not provided or is 'global', use only remote/global sources
-    if country_raw and country_raw != "global" and adzuna_countries:
-        providers = [
-            _adzuna_fetch,
-            _indeed_rss_fetch if country_raw in {"mx", "co", "pa"} else None,
-            None,
-            None,
-        ]
+    if country_raw != "global" and adzuna_countries:
+        providers = [("adzuna", _adzuna_fetch)]
+        if country_raw in {"mx", "co", "pa"}:
+            providers.append(("indeed", _indeed_rss_fetch))
     else:
+        # don't call Adzuna for global/unsupported countries
         providers = [
-            None,  # don't call Adzuna for global/unsupported countries
-            _remotive_fetch,
-            _arbeitnow_fetch,
-            _remoteok_fetch,
+            ("remotive", _remotive_fetch),
+            ("arbeitnow", _arbeitnow_fetch),
+            ("remoteok", _remoteok_fetch),
         ]
-    results = []
-    total_estimate = 0
-    for fn in providers:
-        if fn is None:
-            continue
+    common = dict(
+        query=params["q"],
+        location=params["location"],
+        remote=params["remote"],
+        min_salary=params["min_salary"],
+        max_salary=params["max_salary"],
+        # Providers always return their first page; client pages are sliced from the merged set
+        page=1,
+        per_page=min(params["source_limit"], 50),
+        contract_time=params["contract_time"],
+        contract_type=params["contract_type"],
+        distance=params["distance"],
+        max_days_old=params["max_days_old"],
+        sort_by=params["sort"],
+        countries_filter=shortlist,
+        per_source_limit=params["source_limit"],
+    )
+    # One task per provider call; Adzuna fans out to one task per country
+    tasks = []
+    for name, fn in providers:
+        if fn is _adzuna_fetch and len(adzuna_countries) > 1:
+            for ctry in adzuna_countries:
+                tasks.append((name, fn, {**common, "country": ctry}))
+        else:
+            tasks.append((name, fn, {**common, "country": adzuna_countries[0] if adzuna_countries else "mx"}))
+    return tasks
+
+
+def _stream_format() -> str | None:
+    """``ndjson`` or ``sse`` when the client asked for ``?stream=...``, else None."""
+    value = (request.args.get("stream") or "").lower().strip()
+    if value in ("", "0", "false"):
+        return None
+    if value == "sse" or "text/event-stream" in (request.headers.get("Accept") or ""):
+        return "sse"
+    return "ndjson"
+
+
+def _dedup_key(item: dict) -> tuple:
+    return (item.get("title"), item.get("company"), item.get("url"))
+
+
+def _optional_user_id() -> int | None:
+    """Id of the caller when a valid JWT was sent; anonymous (None) otherwise.
+
+    An expired or malformed token downgrades to an anonymous search instead of
+    failing it.
+    """
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+        return int(identity) if identity else None
+    except (jwt_ex.JWTExtendedException, PyJWTError, ValueError):
+        return None
+
+
+_FAVORITES_IN_CHUNK = 500
+
+
+def _favorite_urls(user_id: int, urls: list | None = None) -> set[str]:
+    """The user's favorite URLs among ``urls`` (all of them when ``urls`` is None).
+
+    Served by the (user_id, url) unique index: one ``IN (...)`` query per 500 URLs.
+    """
+    query = db.session.query(FavoriteJob.url).filter(
+        FavoriteJob.user_id == user_id, FavoriteJob.deleted_at.is_(None)
+    )
+    if urls is None:
+        return {u for (u,) in query.all()}
+    wanted = sorted({u for u in urls if u})
+    found: set[str] = set()
+    for i in range(0, len(wanted), _FAVORITES_IN_CHUNK):
+        chunk = wanted[i:i + _FAVORITES_IN_CHUNK]
+        found.update(u for (u,) in query.filter(FavoriteJob.url.in_(chunk)).all())
+    return found
+
+
+def _annotate_favorites(items: list, user_id: int | None) -> list:
+    """Copies of ``items`` with ``is_favorite`` set; cached postings are never mutated."""
+    if user_id is None or not items:
+        return items
+    favorites = _favorite_urls(user_id, [it.get("url") for it in items])
+    return [{**it, "is_favorite": it.get("url") in favorites} for it in items]
+
+
+@jobs_bp.get("/search")
+@limiter.limit("60/minute")
+def search_jobs():
+    params = _search_params(request.args)
+    tasks = _provider_tasks(params)
+    user_id = _optional_user_id()
+    stream_format = _stream_format()
+    if stream_format:
+        # The stream outlives the request context, so load the user's favorites up front
+        favorites = _favorite_urls(user_id) if user_id is not None else None
+        return _stream_search(tasks, stream_format, favorites)
+    # One cached result set per canonical search; every page/format is a view of it
+    key = _search_key(params)
+    click_rollups.ensure_started()
+    result = _search_cache.get_or_compute(key, lambda: _collect_results(tasks, params))
+    items = result["items"]
+    with_meta = (request.args.get("with_meta") or "false").lower() == "true"
+    cursor = request.args.get("cursor")
+    if not cursor and "page" not in request.args and "per_page" not in request.args:
+        # Legacy behaviour: the whole merged set
+        items = _annotate_favorites(items, user_id)
+        if with_meta:
+            return jsonify({"items": items, "total": result["total"]})
+        return jsonify(items)
+
+    try:
+        per_page = min(max(int(request.args.get("per_page", 20)), 1), 100)
+    except ValueError:
+        return jsonify({"error": "per_page must be a positive integer"}), 400
+    version = result.get("version") or _result_version(items)
+    if cursor:
         try:
-            # Fan-out for Adzuna if multiple countries; single call for other providers
-            if fn is _adzuna_fetch and len(adzuna_countries) > 1:
-                tmp_items = []
-                tmp_total = 0
-                for ctry in adzuna_countries:
-                    sub_items, sub_total = fn(
-                        query=query,
-                        location=location,
-                        remote=remote,
-                        min_salary=min_salary,
-                        max_salary=max_salary,
-                        page=page,
-                        per_page=per_page,
-                        country=ctry,
-                        contract_time=contract_time,
-                        contract_type=contract_type,
-                        distance=distance,
-                        max_days_old=max_days_old,
-                        sort_by=sort_by,
-                        countries_filter=shortlist,
-                        per_source_limit=int(request.args.get("source_limit", 150)),
-                    )
-                    tmp_items.extend(sub_items)
-                    tmp_total += (sub_total or 0)
-                items, total = tmp_items, tmp_total
-            else:
-                items, total = fn(
-                    query=query,
-                    location=location,
-                    remote=remote,
-                    min_salary=min_salary,
-                    max_salary=max_salary,
-                    page=page,
-                    per_page=per_page,
-                    country=adzuna_countries[0] if adzuna_countries else "mx",
-                    contract_time=contract_time,
-                    contract_type=contract_type,
-                    distance=distance,
-                    max_days_old=max_days_old,
-                    sort_by=sort_by,
-                    countries_filter=shortlist,
-                    per_source_limit=int(request.args.get("source_limit", 150)),
-                )
-            results.extend(items)
-            total_estimate += (total or 0)
-        except Exception as e:
-            logger.exception("jobs provider error: %s", e)
-            continue
+            offset, cursor_version = _decode_cursor(cursor, key)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if cursor_version != version:
+            # The cached set was refreshed (and re-ranked): the offset points into another list
+            return jsonify({"error": "results changed, start again from the first page"}), 410
+    else:
+        try:
+            offset = (max(int(request.args.get("page", 1)), 1) - 1) * per_page
+        except ValueError:
+            return jsonify({"error": "page must be a positive integer"}), 400
+    page_items = _annotate_favorites(items[offset:offset + per_page], user_id)
+    next_cursor = _encode_cursor(key, version, offset + per_page) if offset + per_page < len(items) else None
+    if with_meta:
+        return jsonify({
+            "items": page_items,
+            "total": result["total"],
+            "count": len(items),
+            "next_cursor": next_cursor,
+        })
+    resp = jsonify(page_items)
+    if next_cursor:
+        resp.headers["X-Next-Cursor"] = next_cursor
+    return resp
+
+
+def _encode_cursor(key: str, version: str, offset: int) -> str:
+    """Opaque cursor: the offset into one version of the merged set, bound to its search key."""
+    raw = json.dumps({"k": key[:12], "v": version, "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, key: str) -> tuple[int, str | None]:
+    """``(offset, result version)`` of a cursor issued for this search."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        offset = int(data["o"])
+    except Exception:
+        raise ValueError("invalid cursor")
+    if data.get("k") != key[:12] or offset < 0:
+        raise ValueError("cursor does not belong to this search")
+    return offset, data.get("v")
+
+
+def _collect_results(tasks: list, params: dict) -> dict:
+    """Run every provider task, merge and dedupe the results, then rank them.
+
+    Providers are interleaved round-robin (in task order) before ranking, so
+    postings with equal scores keep a stable order that mixes all sources.
+    """
+    groups = []
+    total_estimate = 0
+    for items, total in _run_providers(tasks):
+        groups.append(items)
+        total_estimate += (total or 0)
+    results = [r for row in zip_longest(*groups) for r in row if r is not None]
     seen = set()
     deduped = []
     for r in results:
-        key = (r.get("title"), r.get("company"), r.get("url"))
+        key = _dedup_key(r)
         if key in seen:
             continue
         seen.add(key)
         deduped.append(r)
+    deduped = collapse_near_duplicates(deduped, _normalize_text)
+    ranked = rank(deduped, params["q"], click_rollups.popularity(), _normalize_text, sort=params["sort"])
     logger.info("jobs search deduped=%s", len(deduped))
-    if with_meta:
-        return jsonify({"items": deduped, "total": total_estimate})
-    return jsonify(deduped)
+    return {"items": ranked, "total": total_estimate, "version": _result_version(ranked)}
+
+
+def _result_version(items: list) -> str:
+    """Fingerprint of a ranked result set. It is derived from the content, so workers that
+    merged the same postings in the same order agree on it."""
+    raw = "\n".join(str(i.get("url") or "") for i in items)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def _stream_search(tasks: list, fmt: str, favorites: set[str] | None = None) -> Response:
+    """Emit postings as each provider finishes (NDJSON lines or SSE events).
+
+    Dedup state is shared across providers, so a posting is only sent once.
+    When a later near-duplicate is richer than the copy already sent, the same
+    "keep the richer record" rule as the non-stream response applies: a
+    ``{"replaces": <sent url>, "item": {...}}`` message (``event: replace`` in
+    SSE) swaps it in. The last message carries per-provider counts:
+    ``{"done": true, ...}`` in NDJSON, an ``event: done`` in SSE. With
+    ``favorites`` each posting gets ``is_favorite``.
+    """
+    options = _fan_out_options()
+
+    def encode(event: str, payload: dict) -> str:
+        data = json.dumps(payload, ensure_ascii=False)
+        if fmt == "sse":
+            return f"event: {event}\ndata: {data}\n\n"
+        return data + "\n"
+
+    def generate():
+        seen = set()
+        near = NearDuplicateIndex(_normalize_text)
+        kept: list[dict] = []  # near-duplicate index position -> posting sent for it
+        providers: dict[str, dict] = {}
+        sent = 0
+        total_estimate = 0
+        for idx, items, total in _fan_out(tasks, **options):
+            name = tasks[idx][0]
+            counts = providers.setdefault(name, {"items": 0, "total": 0})
+            counts["total"] += (total or 0)
+            total_estimate += (total or 0)
+            for r in items:
+                key = _dedup_key(r)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if favorites is not None:
+                    r = {**r, "is_favorite": r.get("url") in favorites}
+                sig = near.signature(r)
+                if sig is not None:
+                    pos = near.find(sig, r)
+                    if pos is not None:
+                        if richness(r) > richness(kept[pos]):
+                            yield encode("replace", {"replaces": kept[pos].get("url"), "item": r})
+                            kept[pos] = r
+                        continue
+                    near.add(sig, r)
+                    kept.append(r)
+                counts["items"] += 1
+                sent += 1
+                yield encode("item", r)
+        logger.info("jobs search streamed=%s", sent)
+        yield encode("done", {"done": True, "items": sent, "total": total_estimate, "providers": providers})
+
+    mimetype = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return Response(generate(), mimetype=mimetype, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def _get_executor(workers: int) -> ThreadPoolExecutor:
+    """Process-wide pool for provider fan-out, recreated after a fork."""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jobs-fanout")
+                _executor_pid = pid
+    return _executor
+
+
+def _fan_out(tasks: list, *, deadline: float, concurrent: bool, workers: int):
+    """Run provider tasks and yield ``(index, items, total)`` as each one finishes.
+
+    In concurrent mode every task runs at once on the shared pool and the whole
+    fan-out is bounded by ``deadline`` seconds; tasks still running at that point
+    are abandoned so the caller gets partial results. Sequential mode keeps the
+    old one-after-another behaviour but still stops at the deadline.
+    """
+    if not concurrent:
+        started = time.monotonic()
+        for idx, (_, fn, kwargs) in enumerate(tasks):
+            if time.monotonic() - started > deadline:
+                logger.warning("jobs search deadline %.1fs reached; skipped=%s", deadline, len(tasks) - idx)
+                return
+            try:
+                items, total = fn(**kwargs)
+            except ProviderUnavailable as e:
+                logger.info("jobs provider skipped: %s", e)
+                continue
+            except Exception as e:
+                logger.exception("jobs provider error: %s", e)
+                continue
+            yield idx, items, total
+        return
+
+    executor = _get_executor(workers)
+    futures = {executor.submit(fn, **kwargs): idx for idx, (_, fn, kwargs) in enumerate(tasks)}
+    try:
+        for fut in as_completed(futures, timeout=deadline):
+            try:
+                items, total = fut.result()
+            except ProviderUnavailable as e:
+                logger.info("jobs provider skipped: %s", e)
+                continue
+            except Exception as e:
+                logger.exception("jobs provider error: %s", e)
+                continue
+            yield futures[fut], items, total
+    except FuturesTimeout:
+        pending = [tasks[idx][0] for fut, idx in futures.items() if not fut.done()]
+        logger.warning("jobs search deadline %.1fs reached; pending=%s", deadline, pending)
+    finally:
+        for fut in futures:
+            fut.cancel()
+
+
+def _fan_out_options() -> dict:
+    """Read the fan-out settings while the app context is available."""
+    cfg = current_app.config
+    return {
+        "deadline": float(cfg.get("JOBS_SEARCH_DEADLINE", 12.0)),
+        "concurrent": bool(cfg.get("JOBS_CONCURRENT_FANOUT", True)),
+        "workers": int(cfg.get("JOBS_FANOUT_WORKERS", 16)),
+    }
+
+
+def _run_providers(tasks: list) -> list:
+    """Collect fan-out results back into task order so merging stays deterministic."""
+    done = {idx: (items, total) for idx, items, total in _fan_out(tasks, **_fan_out_options())}
+    return [done[idx] for idx in sorted(done)]
+
+
+def _provider_get(provider: str, url: str, **kwargs) -> httpx.Response:
+    """GET through the provider's pooled client, guarded by its circuit breaker.
+
+    Raises ProviderUnavailable without touching the network while the breaker is
+    open. 5xx, 403 and 429 answers count as failures (RemoteOK and Indeed block
+    with 403/429); any other status means the provider is up.
+    """
+    with provider_health.call(provider) as timeout:
+        started = time.monotonic()
+        try:
+            resp = provider_client(provider).get(url, timeout=timeout, **kwargs)
+        except httpx.HTTPError as e:
+            provider_health.record_failure(provider, time.monotonic() - started, repr(e))
+            raise
+        _record_status(provider, resp.status_code, time.monotonic() - started)
+        return resp
+
+
+@contextmanager
+def _provider_stream(provider: str, url: str, **kwargs):
+    """Streaming variant of ``_provider_get``; the body is read by the caller.
+
+    Latency is measured to the response headers. Leaving the block early closes
+    the connection, so callers can stop downloading once they have enough.
+    """
+    with provider_health.call(provider) as timeout:
+        started = time.monotonic()
+        try:
+            with provider_client(provider).stream("GET", url, timeout=timeout, **kwargs) as resp:
+                _record_status(provider, resp.status_code, time.monotonic() - started)
+                yield resp
+        except httpx.HTTPError as e:
+            provider_health.record_failure(provider, time.monotonic() - started, repr(e))
+            raise
+
+
+def _record_status(provider: str, status_code: int, elapsed: float) -> None:
+    if status_code >= 500 or status_code in (403, 429):
+        provider_health.record_failure(provider, elapsed, f"HTTP {status_code}")
+    else:
+        provider_health.record_success(provider, elapsed)
+
+
+@jobs_bp.get("/metrics")
+@limiter.limit("30/minute")
+def jobs_metrics():
+    """Provider health, search cache, feed snapshot, index and click stats for operators.
+
+    Disabled (404) unless JOBS_METRICS_TOKEN is set; callers send it as X-Metrics-Token.
+    """
+    token = os.getenv("JOBS_METRICS_TOKEN")
+    if not token:
+        return jsonify({"error": "Not found"}), 404
+    if not hmac.compare_digest(request.headers.get("X-Metrics-Token", ""), token):
+        return jsonify({"error": "Forbidden"}), 403
+    return jsonify({
+        "providers": provider_health.snapshot(),
+        "cache": _search_cache.stats(),
+        "snapshots": feed_snapshots.status(),
+        "index": _feed_index.stats(),
+        "clicks": click_buffer.stats(),
+        "rollups": click_rollups.status(),
+    })
 
 
 @jobs_bp.get("/providers/adzuna/version")
@@ -142,8 +528,8 @@ def adzuna_version():
         return jsonify({"error": "Missing ADZUNA_APP_ID/ADZUNA_APP_KEY"}), 400
     url = f"https://api.adzuna.com/v1/api/jobs/{country}/version"
     params = {"app_id": app_id, "app_key": app_key, "content-type": "application/json"}
-    with httpx.Client(timeout=10.0) as client:
-        resp = client.get(url, params=params)
+    client = provider_client("adzuna")
+    resp = client.get(url, params=params)
     return jsonify({"status": resp.status_code, "body": resp.json() if resp.headers.get("content-type", "").startswith("application/json") else resp.text})
 
 
@@ -227,33 +613,196 @@ def _adzuna_fetch(
     url = f"https://api.adzuna.com/v1/api/jobs/{country}/search/{max(1, page)}"
     params.update({"app_id": app_id, "app_key": app_key})
     logger.info("adzuna GET %s params=%s", url, {k: v for k, v in params.items() if k not in {"app_id", "app_key"}})
-    with httpx.Client(timeout=10.0) as client:
-        resp = client.get(url, params=params)
-        logger.info("adzuna status=%s", resp.status_code)
+    resp = _provider_get("adzuna", url, params=params)
+    logger.info("adzuna status=%s", resp.status_code)
+    if resp.status_code != 200:
+        try:
+            logger.warning("adzuna error body=%s", resp.text[:500])
+        except Exception:
+            pass
+        return [], 0
+    data = resp.json()
+    results = data.get("results", [])
+    total = data.get("count", 0)
+    logger.info("adzuna results_count=%s total=%s", len(results), total)
+    out = []
+    for item in results:
+        out.append({
+            "title": item.get("title"),
+            "company": item.get("company", {}).get("display_name"),
+            "location": item.get("location", {}).get("display_name"),
+            "url": item.get("redirect_url"),
+            "salary_min": item.get("salary_min"),
+            "salary_max": item.get("salary_max"),
+            "contract_time": item.get("contract_time"),
+            "contract_type": item.get("contract_type"),
+            "source": "adzuna",
+            "posted_at": parse_posted_at(item.get("created")),
+        })
+    return out, int(total or 0)
+
+
+# Location markers that keep a full-feed posting in scope for PA/CO/MX users
+_COUNTRY_MARKERS = ["panama", "colombia", "mexico"]
+_LATAM_MARKERS = _COUNTRY_MARKERS + ["latam", "latin america", "anywhere", "global", "remote"]
+
+
+class _FeedError(Exception):
+    """A full-feed provider answered with something other than a usable feed."""
+
+
+def _iter_json_items(resp: httpx.Response, path: str):
+    """Yield the elements of the JSON array at ``path`` ("" for a top-level array).
+
+    With ijson installed the body is decoded incrementally from the byte stream,
+    so neither the raw document nor the fully decoded one is ever held in memory
+    and a caller that stops iterating also stops the download. Without ijson it
+    falls back to decoding the whole body.
+    """
+    if ijson is None:
+        data = json.loads(resp.read())
+        for key in filter(None, path.split(".")):
+            data = data.get(key) if isinstance(data, dict) else None
+        if isinstance(data, list):
+            yield from data
+        return
+    events = ijson.sendable_list()
+    coro = ijson.items_coro(events, f"{path}.item" if path else "item", use_float=True)
+    try:
+        for chunk in resp.iter_bytes():
+            coro.send(chunk)
+            if events:
+                batch = list(events)
+                del events[:]
+                yield from batch
+        coro.close()
+    except ijson.JSONError as e:
+        raise ValueError(f"invalid JSON feed: {e}") from e
+    yield from events
+
+
+def _target_country(location: str) -> str | None:
+    """Map the user's location text to the country the feeds must mention explicitly."""
+    loc_filter = _normalize_text(location)
+    for country in _COUNTRY_MARKERS:
+        if country in loc_filter:
+            return country
+    return None
+
+
+def _record_facets(record: dict):
+    """Location markers found in a record, precomputed as index facets."""
+    for marker in _LATAM_MARKERS + ["brazil", "brasil"]:
+        if marker in record["location"]:
+            yield f"loc:{marker}"
+        if marker in record["text"]:
+            yield f"text:{marker}"
+    if record["remote"]:
+        yield "remote"
+
+
+# Inverted index over the feed snapshots, rebuilt for a source before its new
+# snapshot is published. Fetchers scan the snapshot while a source is not indexed
+_feed_index = PostingIndex(_record_facets)
+feed_snapshots.add_listener(_feed_index.update_source)
+
+
+def _indexed_candidates(source: str, query: str) -> set[int]:
+    """Ids of ``source`` postings matching the keyword query."""
+    ids = _feed_index.facet(f"source:{source}")
+    matched = _feed_index.match(_normalize_text(query))
+    if matched is not None:
+        ids &= matched
+    return ids
+
+
+def _feed_record(item: dict, *, location: str, description: str = "", remote_tag: bool = False) -> dict:
+    """Pair a posting with its accent-folded search fields, computed once at ingestion."""
+    title = _normalize_text(item.get("title"))
+    company = _normalize_text(item.get("company"))
+    loc = _normalize_text(location)
+    return {
+        "item": item,
+        "title": title,
+        "company": company,
+        "location": loc,
+        "text": " ".join(x for x in (title, company, loc, _normalize_text(description)) if x),
+        "remote": bool(remote_tag),
+    }
+
+
+def _remotive_records(search: str = "", limit: int | None = None):
+    """Stream the Remotive feed, yielding normalized records as they are decoded."""
+    params = {"search": search} if search else {}
+    if limit:
+        params["limit"] = str(limit)
+    with _provider_stream("remotive", "https://remotive.com/api/remote-jobs", params=params) as resp:
         if resp.status_code != 200:
-            try:
-                logger.warning("adzuna error body=%s", resp.text[:500])
-            except Exception:
-                pass
-            return [], 0
-        data = resp.json()
-        results = data.get("results", [])
-        total = data.get("count", 0)
-        logger.info("adzuna results_count=%s total=%s", len(results), total)
-        out = []
-        for item in results:
-            out.append({
-                "title": item.get("title"),
-                "company": item.get("company", {}).get("display_name"),
-                "location": item.get("location", {}).get("display_name"),
-                "url": item.get("redirect_url"),
-                "salary_min": item.get("salary_min"),
-                "salary_max": item.get("salary_max"),
-                "contract_time": item.get("contract_time"),
-                "contract_type": item.get("contract_type"),
-                "source": "adzuna",
-            })
-        return out, int(total or 0)
+            raise _FeedError(f"remotive HTTP {resp.status_code}")
+        for j in _iter_json_items(resp, "jobs"):
+            if not isinstance(j, dict):
+                continue
+            loc_str = j.get("candidate_required_location") or j.get("job_type") or "Remote"
+            item = {
+                "title": j.get("title"),
+                "company": j.get("company_name"),
+                "location": loc_str,
+                "url": j.get("url"),
+                "salary_min": None,
+                "salary_max": None,
+                "contract_time": None,
+                "contract_type": None,
+                "source": "remotive",
+                "posted_at": parse_posted_at(j.get("publication_date")),
+            }
+            yield _feed_record(item, location=loc_str, description=j.get("description") or "")
+
+
+def _remotive_load() -> list:
+    """Full normalized Remotive feed for the snapshot."""
+    return list(_remotive_records())
+
+
+def _remotive_filter(records: Iterable[dict], *, query: str, location: str, remote: str | None, per_source_limit: int) -> list:
+    q = _normalize_text(query)
+    target_country = _target_country(location)
+    out = []
+    for rec in records:
+        if q and q not in rec["text"]:
+            continue
+        loc_lower = rec["location"]
+        # strict filter toward PA/CO/MX/LatAm, exclude Brazil explicitly
+        if target_country:
+            # Strict: must mention target country explicitly
+            keep = target_country in loc_lower
+        else:
+            keep = any(x in loc_lower for x in _LATAM_MARKERS)
+        if "brazil" in loc_lower or "brasil" in loc_lower:
+            keep = False
+        if remote is not None and remote.lower() == "false":
+            # user asked not remote; Remotive is mostly remote, so skip
+            if not (target_country and target_country in loc_lower):
+                keep = False
+        if not keep:
+            continue
+        out.append(rec["item"])
+        if len(out) >= per_source_limit:
+            break
+    return out
+
+
+def _remotive_select(*, query: str, location: str, remote: str | None, per_source_limit: int) -> list:
+    """Index-backed equivalent of ``_remotive_filter`` over the snapshot."""
+    ids = _indexed_candidates("remotive", query)
+    target_country = _target_country(location)
+    if target_country:
+        ids &= _feed_index.facet(f"loc:{target_country}")
+    elif remote is not None and remote.lower() == "false":
+        return []
+    else:
+        ids &= _feed_index.facet(*[f"loc:{m}" for m in _LATAM_MARKERS])
+    ids -= _feed_index.facet("loc:brazil", "loc:brasil")
+    return _feed_index.items(ids, per_source_limit)
 
 
 def _remotive_fetch(
@@ -275,56 +824,88 @@ def _remotive_fetch(
     per_source_limit: int,
 ):
     """Remotive public API - remote/global roles. No API key."""
-    params = {"search": query or "", "limit": str(max(50, min(per_source_limit, 300)))}
-    url = "https://remotive.com/api/remote-jobs"
-    with httpx.Client(timeout=10.0) as client:
-        resp = client.get(url, params=params)
+    snapshot = feed_snapshots.get("remotive")
+    if snapshot is not None:
+        if _feed_index.has_source("remotive"):
+            out = _remotive_select(query=query, location=location, remote=remote, per_source_limit=per_source_limit)
+        else:
+            out = _remotive_filter(snapshot, query=query, location=location, remote=remote, per_source_limit=per_source_limit)
+        return out, len(out)
+    # No snapshot yet: let Remotive filter by query server-side to keep the download small,
+    # and stop decoding as soon as enough postings passed the location filter
+    try:
+        with closing(_remotive_records(query or "", max(50, min(per_source_limit, 300)))) as records:
+            out = _remotive_filter(records, query="", location=location, remote=remote, per_source_limit=per_source_limit)
+    except (_FeedError, ValueError):
+        return [], 0
+    return out, len(out)
+
+
+def _arbeitnow_records():
+    """Stream the Arbeitnow job board feed, yielding normalized records."""
+    with _provider_stream("arbeitnow", "https://www.arbeitnow.com/api/job-board-api") as resp:
         if resp.status_code != 200:
-            return [], 0
-        data = resp.json()
-        jobs = data.get("jobs", [])
-        out = []
-        # Determine strict target based on user location
-        loc_filter = _normalize_text(location)
-        target_country = None
-        if any(k in loc_filter for k in ["panama", "panama"]):
-            target_country = "panama"
-        elif "colombia" in loc_filter:
-            target_country = "colombia"
-        elif any(k in loc_filter for k in ["mexico", "mexico"]):
-            target_country = "mexico"
-        for j in jobs:
-            loc_str = j.get("candidate_required_location") or j.get("job_type") or "Remote"
-            # strict filter toward PA/CO/MX/LatAm, exclude Brazil explicitly
-            keep = False
-            loc_lower = _normalize_text(loc_str)
-            latam_markers = ["panama", "colombia", "mexico", "latam", "latin america", "remote", "anywhere", "global"]
-            if target_country:
-                # Strict: must mention target country explicitly
-                keep = target_country in loc_lower
-            else:
-                if any(x in loc_lower for x in latam_markers):
-                    keep = True
-            if "brazil" in loc_lower or "brasil" in loc_lower:
-                keep = False
-            if remote is not None and remote.lower() == "false":
-                # user asked not remote; Remotive is mostly remote, so skip
-                if not (target_country and target_country in loc_lower):
-                    keep = False
-            if not keep:
+            raise _FeedError(f"arbeitnow HTTP {resp.status_code}")
+        for j in _iter_json_items(resp, "data"):
+            if not isinstance(j, dict):
                 continue
-            out.append({
-                "title": j.get("title"),
-                "company": j.get("company_name"),
-                "location": loc_str,
+            loc = j.get("location") or ""
+            remote_tag = j.get("remote") or False
+            item = {
+                "title": j.get("title") or "",
+                "company": j.get("company"),
+                "location": loc if loc else ("Remote" if remote_tag else None),
                 "url": j.get("url"),
                 "salary_min": None,
                 "salary_max": None,
                 "contract_time": None,
                 "contract_type": None,
-                "source": "remotive",
-            })
-        return out, len(out)
+                "source": "arbeitnow",
+                "posted_at": parse_posted_at(j.get("created_at")),
+            }
+            yield _feed_record(item, location=loc, remote_tag=remote_tag)
+
+
+def _arbeitnow_load() -> list:
+    """Full normalized Arbeitnow feed for the snapshot."""
+    return list(_arbeitnow_records())
+
+
+def _arbeitnow_filter(records: Iterable[dict], *, query: str, location: str, remote: str | None, per_source_limit: int) -> list:
+    q = _normalize_text(query)
+    target_country = _target_country(location)
+    out = []
+    for rec in records:
+        # text filter (title, company, location)
+        if q and q not in rec["text"]:
+            continue
+        loc_lower = rec["location"]
+        if target_country:
+            # Strict: must mention target country explicitly
+            keep_country = target_country in loc_lower
+        else:
+            keep_country = any(x in loc_lower for x in _COUNTRY_MARKERS) or rec["remote"]
+        if not keep_country:
+            continue
+        if remote is not None and remote.lower() == "false" and rec["remote"]:
+            continue
+        out.append(rec["item"])
+        if len(out) >= per_source_limit:
+            break
+    return out
+
+
+def _arbeitnow_select(*, query: str, location: str, remote: str | None, per_source_limit: int) -> list:
+    """Index-backed equivalent of ``_arbeitnow_filter`` over the snapshot."""
+    ids = _indexed_candidates("arbeitnow", query)
+    target_country = _target_country(location)
+    if target_country:
+        ids &= _feed_index.facet(f"loc:{target_country}")
+    else:
+        ids &= _feed_index.facet("remote", *[f"loc:{m}" for m in _COUNTRY_MARKERS])
+    if remote is not None and remote.lower() == "false":
+        ids -= _feed_index.facet("remote")
+    return _feed_index.items(ids, per_source_limit)
 
 
 def _arbeitnow_fetch(
@@ -346,55 +927,85 @@ def _arbeitnow_fetch(
     per_source_limit: int,
 ):
     """Arbeitnow Job Board API - no key."""
-    url = "https://www.arbeitnow.com/api/job-board-api"
-    with httpx.Client(timeout=10.0) as client:
-        resp = client.get(url)
+    snapshot = feed_snapshots.get("arbeitnow")
+    if snapshot is not None:
+        if _feed_index.has_source("arbeitnow"):
+            out = _arbeitnow_select(query=query, location=location, remote=remote, per_source_limit=per_source_limit)
+        else:
+            out = _arbeitnow_filter(snapshot, query=query, location=location, remote=remote, per_source_limit=per_source_limit)
+        return out, len(out)
+    try:
+        with closing(_arbeitnow_records()) as records:
+            out = _arbeitnow_filter(records, query=query, location=location, remote=remote, per_source_limit=per_source_limit)
+    except (_FeedError, ValueError):
+        return [], 0
+    return out, len(out)
+
+
+def _remoteok_records():
+    """Stream the RemoteOK feed (a top-level JSON array), yielding normalized records."""
+    with _provider_stream("remoteok", "https://remoteok.com/api") as resp:
         if resp.status_code != 200:
-            return [], 0
-        data = resp.json()
-        jobs = data.get("data", [])
-        out = []
-        for j in jobs:
-            title = j.get("title") or ""
-            company = j.get("company")
-            loc = j.get("location") or ""
-            remote_tag = j.get("remote") or False
-            # text filter
-            if query and query.lower() not in f"{title} {company} {loc}".lower():
-                continue
-            # country filter (loose, by location text)
-            loc_filter = _normalize_text(location)
-            target_country = None
-            if "panama" in loc_filter:
-                target_country = "panama"
-            elif "colombia" in loc_filter:
-                target_country = "colombia"
-            elif "mexico" in loc_filter:
-                target_country = "mexico"
-            loc_lower = _normalize_text(loc)
-            if target_country:
-                # Strict: must mention target country explicitly
-                keep_country = target_country in loc_lower
-            else:
-                keep_country = any(x in loc_lower for x in ["panama", "colombia", "mexico"]) or remote_tag
-            if not keep_country:
-                continue
-            if remote is not None and remote.lower() == "false" and remote_tag:
+            raise _FeedError(f"remoteok HTTP {resp.status_code}")
+        # First element often contains metadata
+        for j in _iter_json_items(resp, ""):
+            if not isinstance(j, dict) or not j.get("position"):
                 continue
-            out.append({
-                "title": title,
-                "company": company,
-                "location": loc if loc else ("Remote" if remote_tag else None),
-                "url": j.get("url"),
+            loc = (j.get("location") or "Remote").strip()
+            item = {
+                "title": j.get("position") or "",
+                "company": j.get("company") or j.get("company_name"),
+                "location": loc,
+                "url": j.get("url") or j.get("apply_url"),
                 "salary_min": None,
                 "salary_max": None,
                 "contract_time": None,
                 "contract_type": None,
-                "source": "arbeitnow",
-            })
-            if len(out) >= per_source_limit:
-                break
-        return out, len(out)
+                "source": "remoteok",
+                "posted_at": parse_posted_at(j.get("epoch") or j.get("date")),
+            }
+            yield _feed_record(item, location=loc, description=j.get("description") or "")
+
+
+def _remoteok_load() -> list:
+    """Full normalized RemoteOK feed for the snapshot."""
+    return list(_remoteok_records())
+
+
+def _remoteok_filter(records: Iterable[dict], *, query: str, location: str, remote: str | None, per_source_limit: int) -> list:
+    q = _normalize_text(query)
+    target_country = _target_country(location)
+    out = []
+    for rec in records:
+        text = rec["text"]
+        if q and q not in text:
+            continue
+        # Strict: if target country specified, must mention it explicitly
+        if target_country:
+            if target_country not in text:
+                continue
+        else:
+            # No specific location: allow LatAm markers
+            if not any(m in text for m in _LATAM_MARKERS):
+                continue
+        if "brazil" in text or "brasil" in text:
+            continue
+        out.append(rec["item"])
+        if len(out) >= per_source_limit:
+            break
+    return out
+
+
+def _remoteok_select(*, query: str, location: str, per_source_limit: int) -> list:
+    """Index-backed equivalent of ``_remoteok_filter`` over the snapshot."""
+    ids = _indexed_candidates("remoteok", query)
+    target_country = _target_country(location)
+    if target_country:
+        ids &= _feed_index.facet(f"text:{target_country}")
+    else:
+        ids &= _feed_index.facet(*[f"text:{m}" for m in _LATAM_MARKERS])
+    ids -= _feed_index.facet("text:brazil", "text:brasil")
+    return _feed_index.items(ids, per_source_limit)
 
 
 def _remoteok_fetch(
@@ -416,63 +1027,60 @@ def _remoteok_fetch(
     per_source_limit: int,
 ):
     """RemoteOK public JSON. Nota: filtra LatAm y excluye Brasil."""
-    url = "https://remoteok.com/api"
-    with httpx.Client(timeout=10.0, headers={"User-Agent": "InnovateJobs/1.0"}) as client:
-        resp = client.get(url)
-        if resp.status_code != 200:
-            return [], 0
-        try:
-            data = resp.json()
-        except Exception:
-            return [], 0
-        if not isinstance(data, list):
-            return [], 0
-        # First element often contains metadata
-        posts = [x for x in data if isinstance(x, dict) and x.get("position")]
-        out = []
-        # Determine strict target based on user location
-        loc_filter = _normalize_text(location)
-        target_country = None
-        if "panama" in loc_filter or "panama" in loc_filter:
-            target_country = "panama"
-        elif "colombia" in loc_filter:
-            target_country = "colombia"
-        elif "mexico" in loc_filter or "mexico" in loc_filter:
-            target_country = "mexico"
-        for j in posts:
-            title = j.get("position") or ""
-            company = j.get("company") or j.get("company_name")
-            loc = (j.get("location") or "Remote").strip()
-            desc = (j.get("description") or "")
-            url_job = j.get("url") or j.get("apply_url")
-            text = f"{title} {company} {loc} {desc}".lower()
-            if query and query.lower() not in text:
-                continue
-            # Strict: if target country specified, must mention it explicitly
-            if target_country:
-                if target_country not in text:
-                    continue
-            else:
-                # No specific location: allow LatAm markers
-                include_markers = ["panama", "colombia", "mexico", "latam", "latin america", "anywhere", "global", "remote"]
-                if not any(m in text for m in include_markers):
-                    continue
-            if "brazil" in text or "brasil" in text:
-                continue
-            out.append({
-                "title": title,
-                "company": company,
-                "location": loc,
-                "url": url_job,
-                "salary_min": None,
-                "salary_max": None,
-                "contract_time": None,
-                "contract_type": None,
-                "source": "remoteok",
-            })
-            if len(out) >= per_source_limit:
-                break
+    snapshot = feed_snapshots.get("remoteok")
+    if snapshot is not None:
+        if _feed_index.has_source("remoteok"):
+            out = _remoteok_select(query=query, location=location, per_source_limit=per_source_limit)
+        else:
+            out = _remoteok_filter(snapshot, query=query, location=location, remote=remote, per_source_limit=per_source_limit)
         return out, len(out)
+    try:
+        with closing(_remoteok_records()) as records:
+            out = _remoteok_filter(records, query=query, location=location, remote=remote, per_source_limit=per_source_limit)
+    except (_FeedError, ValueError):
+        return [], 0
+    return out, len(out)
+
+
+feed_snapshots.register("remotive", _remotive_load)
+feed_snapshots.register("arbeitnow", _arbeitnow_load)
+feed_snapshots.register("remoteok", _remoteok_load)
+
+
+def _indeed_item(item: ET.Element, location: str) -> dict | None:
+    """Build a posting from one RSS ``<item>``; None when title or link is missing."""
+    title_elem = item.find("title")
+    link_elem = item.find("link")
+    desc_elem = item.find("description")
+    date_elem = item.find("pubDate")
+    if title_elem is None or link_elem is None:
+        return None
+    title = (title_elem.text or "").strip()
+    url_job = (link_elem.text or "").strip()
+    if not title or not url_job:
+        return None
+    desc = (desc_elem.text or "").strip() if desc_elem is not None else ""
+    # Extract company/location from description if available
+    company = ""
+    location_str = location or ""
+    if desc:
+        # Simple extraction from description
+        parts = desc.split(" - ")
+        if len(parts) >= 2:
+            company = parts[0].strip()
+            location_str = parts[1].strip() if not location else location
+    return {
+        "title": title,
+        "company": company or "Indeed",
+        "location": location_str,
+        "url": url_job,
+        "salary_min": None,
+        "salary_max": None,
+        "contract_time": None,
+        "contract_type": None,
+        "source": "indeed",
+        "posted_at": parse_posted_at(date_elem.text if date_elem is not None else None),
+    }
 
 
 def _indeed_rss_fetch(
@@ -509,48 +1117,41 @@ def _indeed_rss_fetch(
     params = {"q": query or ""}
     if location:
         params["l"] = location
-    url = f"{base_url}?" + "&".join(f"{k}={v}" for k, v in params.items() if v)
-    
+    params = {k: v for k, v in params.items() if v}
+
     try:
-        with httpx.Client(timeout=10.0, headers={"User-Agent": "InnovateJobs/1.0"}) as client:
-            resp = client.get(url)
+        out = []
+        with _provider_stream("indeed", base_url, params=params) as resp:
             if resp.status_code != 200:
                 return [], 0
-            # Parse RSS XML
-            root = ET.fromstring(resp.text)
-            # Indeed RSS uses standard RSS 2.0 format (no namespace)
-            items = root.findall(".//item")
-            out = []
-            for item in items[:per_source_limit]:
-                title_elem = item.find("title")
-                link_elem = item.find("link")
-                desc_elem = item.find("description")
-                if not title_elem or not link_elem:
-                    continue
-                title = (title_elem.text or "").strip()
-                url_job = (link_elem.text or "").strip()
-                desc = (desc_elem.text or "").strip() if desc_elem is not None else ""
-                # Extract company/location from description if available
-                company = ""
-                location_str = location or ""
-                if desc:
-                    # Simple extraction from description
-                    parts = desc.split(" - ")
-                    if len(parts) >= 2:
-                        company = parts[0].strip()
-                        location_str = parts[1].strip() if not location else location
-                out.append({
-                    "title": title,
-                    "company": company or "Indeed",
-                    "location": location_str,
-                    "url": url_job,
-                    "salary_min": None,
-                    "salary_max": None,
-                    "contract_time": None,
-                    "contract_type": None,
-                    "source": "indeed",
-                })
-            return out, len(out)
+            # Parse the RSS 2.0 feed (no namespace) incrementally and stop reading
+            # the body as soon as enough items are collected
+            parser = ET.XMLPullParser(events=("start", "end"))
+            open_elems = []
+            try:
+                for chunk in resp.iter_bytes():
+                    parser.feed(chunk)
+                    for event, elem in parser.read_events():
+                        if event == "start":
+                            open_elems.append(elem)
+                            continue
+                        open_elems.pop()
+                        if elem.tag != "item":
+                            continue
+                        posting = _indeed_item(elem, location)
+                        # Detach the parsed item so memory stays flat however long the feed is
+                        elem.clear()
+                        if open_elems:
+                            open_elems[-1].remove(elem)
+                        if posting:
+                            out.append(posting)
+                        if len(out) >= per_source_limit:
+                            return out, len(out)
+            except ET.ParseError as e:
+                logger.warning("indeed rss parse error after %s items: %s", len(out), e)
+        return out, len(out)
+    except ProviderUnavailable:
+        raise
     except Exception as e:
         logger.warning("indeed rss error: %s", e)
         return [], 0
@@ -572,13 +1173,28 @@ def track_click():
     url = (data.get("url") or "").strip()
     if not url:
         return jsonify({"error": "url required"}), 400
-    click = JobClick(
-        user_id=user_id,
-        url=url,
+    click_rollups.ensure_started()
+    queued = click_buffer.enqueue(
+        user_id,
+        url,
         title=(data.get("title") or ""),
         company=(data.get("company") or ""),
         source=(data.get("source") or ""),
     )
-    db.session.add(click)
-    db.session.commit()
+    if not queued:
+        resp = jsonify({"error": "click tracking busy, retry later"})
+        resp.headers["Retry-After"] = "5"
+        return resp, 503
     return jsonify({"ok": True})
+
+
+@jobs_bp.get("/trending")
+@limiter.limit("60/minute")
+@cache.cached(timeout=60, query_string=True)
+def trending_jobs():
+    """Most clicked job postings over the last ``hours`` (default 24), from the click rollups."""
+    click_rollups.ensure_started()
+    hours = max(1, min(int(_clean_int(request.args.get("hours")) or 24), 24 * 90))
+    limit = max(1, min(int(_clean_int(request.args.get("limit")) or 20), 100))
+    source = (request.args.get("source") or "").strip().lower() or None
+    return jsonify(click_rollups.trending(hours, limit, source))
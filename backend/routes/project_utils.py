@@ -1,4 +1,9 @@
 """Utility functions for project routes."""
+import base64
+import json
+from datetime import datetime
+from functools import partial
+from backend.db_utils import coerce_list, legacy_json
 
 
 def sanitize_str(value: str, max_len: int = 255) -> str:
@@ -16,8 +21,8 @@ def project_to_dict(project) -> dict:
         "title": project.title,
         "description": project.description,
         "technologies": project.technologies,
-        "images": project.images,
-        "links": project.links,
+        "images": legacy_json(project.images),
+        "links": legacy_json(project.links),
         "category": project.category,
         "featured": project.featured,
     }
@@ -29,3 +34,108 @@ def project_to_dict_with_token(project) -> dict:
     data["share_token"] = project.share_token
     return data
 
+
+PROJECT_FIELDS = frozenset({
+    "id", "user_id", "title", "description", "technologies", "images", "links",
+    "category", "featured", "share_token", "created_at", "updated_at", "cover",
+})
+# List screens only show title, category, tags and the cover image
+SUMMARY_FIELDS = ("id", "title", "category", "technologies", "featured", "cover")
+
+
+def parse_fields(raw: str | None) -> tuple[str, ...] | None:
+    """Fields requested with ``fields=`` (``summary`` and/or field names); None
+    means the full representation. Raises ValueError for unknown fields."""
+    names = []
+    for name in (raw or "").split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name == "summary":
+            names.extend(SUMMARY_FIELDS)
+        elif name in PROJECT_FIELDS:
+            names.append(name)
+        else:
+            raise ValueError(f"unknown field: {name}")
+    return tuple(dict.fromkeys(names)) or None
+
+
+def stored_fields(fields) -> list[str]:
+    """Columns (or Firestore fields) needed to render ``fields``, plus the ones
+    used for ordering, cursors and validators."""
+    needed = {"id", "created_at", "updated_at"}
+    needed.update("images" if f == "cover" else f for f in fields)
+    return sorted(needed)
+
+
+_DOC_DEFAULTS = {"title": "", "description": "", "technologies": "", "category": "general", "featured": False}
+
+
+def _cover(images) -> str | None:
+    images = coerce_list(images)
+    return str(images[0]) if images else None
+
+
+def project_fields(project, fields) -> dict:
+    """Sparse representation of a Project row or Firestore document."""
+    if isinstance(project, dict):
+        # Mismos valores por defecto que el formato completo de Firestore
+        def get(name):
+            return project.get(name, _DOC_DEFAULTS.get(name))
+    else:
+        get = partial(getattr, project)
+    data = {}
+    for field in fields:
+        if field == "cover":
+            data[field] = _cover(get("images"))
+            continue
+        value = get(field)
+        if field in ("images", "links"):
+            # Arrays nativos; la API devuelve el string JSON de siempre
+            value = legacy_json(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        data[field] = value
+    return data
+
+
+def encode_cursor(created_at, item_id, order: str) -> str:
+    """Opaque keyset cursor: position ``(created_at, id)`` within one sort order."""
+    if not created_at:
+        # Sin created_at no hay posición que decode_cursor pueda aceptar
+        raise ValueError("cursor position needs created_at")
+    stamp = created_at.isoformat() if isinstance(created_at, datetime) else str(created_at)
+    raw = json.dumps({"t": stamp, "i": item_id, "o": order}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def encode_offset_cursor(offset: int, order: str) -> str:
+    """Opaque cursor for relevance-ranked results, which have no keyset position."""
+    raw = json.dumps({"n": offset, "o": order}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str, id_type: type = int):
+    """Position of a cursor: ``(created_at, id)`` from ``encode_cursor``, an int
+    offset from ``encode_offset_cursor``, or None for an empty cursor.
+
+    ``id_type`` is the type of the ids (int in SQL, str for Firestore documents).
+    Raises ValueError for malformed cursors or cursors issued for another order.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        if "n" in data:
+            position = max(int(data["n"]), 0)
+        else:
+            item_id = data["i"]
+            if not isinstance(item_id, id_type) or isinstance(item_id, bool):
+                raise ValueError("invalid cursor id")
+            position = (datetime.fromisoformat(data["t"]), item_id)
+    except Exception:
+        raise ValueError("invalid cursor")
+    if data.get("o") != order:
+        raise ValueError("cursor was issued for another order")
+    return position
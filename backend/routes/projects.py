@@ -1,19 +1,66 @@
 """Projects blueprint - aggregates all project-related routes."""
-from flask import Blueprint, request, jsonify, redirect, current_app
+from flask import Blueprint, request, jsonify, redirect, current_app, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 from flask_jwt_extended import exceptions as jwt_ex
-from sqlalchemy import or_
-from backend.extensions import db, cache, limiter
+from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import load_only
+from backend.extensions import db, limiter
 from backend.models import Project, User
 from backend.firebase_service import firebase_service
-from .project_utils import sanitize_str, project_to_dict, project_to_dict_with_token
+from backend.db_utils import coerce_list, legacy_json
+from backend.project_search import project_search, query_tokens
+from backend.cache_tags import tagged_cache, FEED_TAG, feed_category_tag
+from .project_utils import (
+    sanitize_str, project_to_dict, project_to_dict_with_token,
+    encode_cursor, encode_offset_cursor, decode_cursor,
+    parse_fields, stored_fields, project_fields,
+)
+from .conditional import make_etag, not_modified, conditional
 from datetime import datetime
 import secrets
+import hashlib
 import json
 
 projects_bp = Blueprint("projects", __name__)
 
 
+def _sparse_columns(fields):
+    """``load_only`` option so unrequested columns (long descriptions) are never read."""
+    return load_only(*(getattr(Project, name) for name in stored_fields(fields)))
+
+
+def _firestore_mask(fields, *extra: str) -> list[str] | None:
+    """Firestore field mask for ``fields`` (the document id always comes back)."""
+    if not fields:
+        return None
+    return sorted({name for name in stored_fields(fields) if name != "id"} | set(extra))
+
+
+# Lists are validated by ETag only: a deletion does not move max(updated_at), so
+# a Last-Modified date would keep answering 304 with the removed project in it.
+def _docs_etag(docs: list, *scope) -> str:
+    """ETag of a list of Firestore documents, without formatting them."""
+    stamps = [d.get("updated_at") for d in docs if d.get("updated_at")]
+    last_modified = max(stamps) if stamps else None
+    return make_etag(*scope, len(docs), last_modified, *sorted(str(d.get("id")) for d in docs))
+
+
+def _rows_etag(query, *scope) -> str:
+    """ETag of a project query from one aggregate (count, max updated_at, max id)."""
+    count, last_modified, max_id = query.order_by(None).with_entities(
+        func.count(Project.id), func.max(Project.updated_at), func.max(Project.id)
+    ).one()
+    return make_etag(*scope, count, last_modified, max_id)
+
+
+def _invalidate_feed(*categories) -> None:
+    """Drop the cached explore feed views a project write can change: all
+    categories and the project's own, before and after the write."""
+    tags = {FEED_TAG}
+    tags.update(feed_category_tag(c) for c in categories if c)
+    tagged_cache.invalidate(*tags)
+
+
 # ============= CRUD Operations =============
 @projects_bp.post("")
 @jwt_required()
@@ -30,30 +77,13 @@ def create_project():
     now = datetime.utcnow()
     
     if use_firebase and firebase_service.is_enabled:
-        # Guardar en Firestore - convertir images y links de string JSON a arrays
-        images_str = data.get("images", "")
-        images_array = []
-        if images_str:
-            try:
-                images_array = json.loads(images_str) if isinstance(images_str, str) else images_str
-            except (json.JSONDecodeError, TypeError):
-                images_array = []
-        
-        links_str = data.get("links", "")
-        links_array = []
-        if links_str:
-            try:
-                links_array = json.loads(links_str) if isinstance(links_str, str) else links_str
-            except (json.JSONDecodeError, TypeError):
-                links_array = []
-        
         project_data = {
             "user_id": user_id_str,  # En Firebase puede ser string
             "title": title,
             "description": data.get("description", ""),
             "technologies": sanitize_str(data.get("technologies", ""), 512),
-            "images": images_array,  # Guardar como array nativo de Firestore
-            "links": links_array,    # Guardar como array nativo de Firestore
+            "images": coerce_list(data.get("images")),  # Array nativo, igual que en SQL
+            "links": coerce_list(data.get("links")),
             "category": sanitize_str(data.get("category", "general"), 128),
             "featured": bool(data.get("featured", False)),
             "created_at": now,
@@ -62,68 +92,26 @@ def create_project():
         # Generar un ID único para el proyecto
         project_id = secrets.token_urlsafe(16)
         firebase_service.save_project(project_id, project_data)
-        cache.clear()
+        project_search.document_saved(project_id, project_data)
+        _invalidate_feed(project_data["category"])
         return jsonify({"id": project_id}), 201
     else:
         # Guardar en SQLite/PostgreSQL (comportamiento original)
         user_id = int(user_id_str)
-        # Debug: ver qué llega en images
-        images_raw = data.get("images", "")
-        print(f"DEBUG create_project - images recibido: {images_raw}, tipo: {type(images_raw)}")
-        
-        # Asegurar que images sea un string JSON válido
-        images_str = ""
-        if images_raw:
-            if isinstance(images_raw, str):
-                # Verificar que sea JSON válido
-                try:
-                    json.loads(images_raw)  # Validar que sea JSON
-                    images_str = images_raw
-                except (json.JSONDecodeError, TypeError):
-                    # Si no es JSON válido, intentar convertirlo
-                    print(f"DEBUG: images no es JSON válido, intentando convertir: {images_raw}")
-                    images_str = json.dumps([images_raw]) if images_raw else "[]"
-            elif isinstance(images_raw, list):
-                # Si viene como lista, convertir a JSON string
-                images_str = json.dumps(images_raw)
-            else:
-                images_str = json.dumps([str(images_raw)]) if images_raw else "[]"
-        else:
-            images_str = "[]"
-        
-        print(f"DEBUG create_project - images final: {images_str}")
-        
-        # Similar para links
-        links_raw = data.get("links", "")
-        links_str = ""
-        if links_raw:
-            if isinstance(links_raw, str):
-                try:
-                    json.loads(links_raw)
-                    links_str = links_raw
-                except (json.JSONDecodeError, TypeError):
-                    links_str = json.dumps([links_raw]) if links_raw else "[]"
-            elif isinstance(links_raw, list):
-                links_str = json.dumps(links_raw)
-            else:
-                links_str = json.dumps([str(links_raw)]) if links_raw else "[]"
-        else:
-            links_str = "[]"
-        
         p = Project(
             user_id=user_id,
             title=title,
             description=data.get("description", ""),
             technologies=sanitize_str(data.get("technologies", ""), 512),
-            images=images_str,
-            links=links_str,
+            images=coerce_list(data.get("images")),
+            links=coerce_list(data.get("links")),
             category=sanitize_str(data.get("category", "general"), 128),
             featured=bool(data.get("featured", False)),
         )
         db.session.add(p)
         db.session.commit()
-        print(f"DEBUG create_project - Proyecto guardado con ID: {p.id}, images: {p.images}")
-        cache.clear()
+        current_app.logger.debug("create_project - proyecto guardado con ID %s, images: %s", p.id, p.images)
+        _invalidate_feed(p.category)
         return jsonify({"id": p.id}), 201
 
 
@@ -154,32 +142,17 @@ def update_project(project_id: str):
         if "technologies" in data:
             update_data["technologies"] = sanitize_str(data.get("technologies", project.get("technologies", "")), 512)
         if "images" in data:
-            # Convertir string JSON a array si es necesario
-            images_val = data.get("images", "")
-            if isinstance(images_val, str):
-                try:
-                    update_data["images"] = json.loads(images_val) if images_val else []
-                except json.JSONDecodeError:
-                    update_data["images"] = []
-            else:
-                update_data["images"] = images_val if images_val else []
+            update_data["images"] = coerce_list(data.get("images"))
         if "links" in data:
-            # Convertir string JSON a array si es necesario
-            links_val = data.get("links", "")
-            if isinstance(links_val, str):
-                try:
-                    update_data["links"] = json.loads(links_val) if links_val else []
-                except json.JSONDecodeError:
-                    update_data["links"] = []
-            else:
-                update_data["links"] = links_val if links_val else []
+            update_data["links"] = coerce_list(data.get("links"))
         if "category" in data:
             update_data["category"] = sanitize_str(data.get("category", project.get("category", "general")), 128)
         if "featured" in data:
             update_data["featured"] = bool(data.get("featured", project.get("featured", False)))
         
         firebase_service.save_project(str(project_id), update_data)
-        cache.clear()
+        project_search.document_saved(str(project_id), update_data)
+        _invalidate_feed(project.get("category"), update_data.get("category"))
         return jsonify({"ok": True})
     else:
         # Actualizar en SQLite/PostgreSQL
@@ -192,6 +165,7 @@ def update_project(project_id: str):
         p = Project.query.get_or_404(project_id_int)
         if p.user_id != user_id:
             return jsonify({"error": "Not owner"}), 403
+        old_category = p.category
         if "title" in data:
             p.title = sanitize_str(data.get("title", p.title))
         if "description" in data:
@@ -199,15 +173,15 @@ def update_project(project_id: str):
         if "technologies" in data:
             p.technologies = sanitize_str(data.get("technologies", p.technologies), 512)
         if "images" in data:
-            p.images = data.get("images", p.images)
+            p.images = coerce_list(data.get("images"))
         if "links" in data:
-            p.links = data.get("links", p.links)
+            p.links = coerce_list(data.get("links"))
         if "category" in data:
             p.category = sanitize_str(data.get("category", p.category), 128)
         if "featured" in data:
             p.featured = bool(data.get("featured", p.featured))
         db.session.commit()
-        cache.clear()
+        _invalidate_feed(old_category, p.category)
         return jsonify({"ok": True})
 
 
@@ -228,7 +202,8 @@ def delete_project(project_id: str):
         if str(project.get("user_id")) != user_id_str:
             return jsonify({"error": "Not owner"}), 403
         firebase_service.delete_project(str(project_id))
-        cache.clear()
+        project_search.document_deleted(str(project_id))
+        _invalidate_feed(project.get("category"))
         return jsonify({"ok": True})
     else:
         # Eliminar de SQLite/PostgreSQL
@@ -243,7 +218,7 @@ def delete_project(project_id: str):
             return jsonify({"error": "Not owner"}), 403
         db.session.delete(p)
         db.session.commit()
-        cache.clear()
+        _invalidate_feed(p.category)
         return jsonify({"ok": True})
 
 
@@ -258,20 +233,11 @@ def get_project(project_id: str):
         project = firebase_service.get_project(str(project_id))
         if not project:
             return jsonify({"error": "Project not found"}), 404
-        
-        # Asegurar que images y links sean strings JSON válidos
-        images = project.get("images")
-        if images is None:
-            images = "[]"
-        elif not isinstance(images, str):
-            # Si es una lista (puede pasar si Firestore lo retorna como lista)
-            images = json.dumps(images) if images else "[]"
-        
-        links = project.get("links")
-        if links is None:
-            links = "[]"
-        elif not isinstance(links, str):
-            links = json.dumps(links) if links else "[]"
+        modified = project.get("updated_at")
+        etag = make_etag("project", project.get("id"), modified, project.get("share_token"))
+        cached = not_modified(etag, modified)
+        if cached:
+            return cached
         
         # Convertir a formato similar al que espera project_to_dict_with_token
         result = {
@@ -280,15 +246,15 @@ def get_project(project_id: str):
             "title": project.get("title", ""),
             "description": project.get("description", ""),
             "technologies": project.get("technologies", ""),
-            "images": images,
-            "links": links,
+            "images": legacy_json(project.get("images")),
+            "links": legacy_json(project.get("links")),
             "category": project.get("category", "general"),
             "featured": project.get("featured", False),
             "share_token": project.get("share_token"),
             "created_at": project.get("created_at").isoformat() if project.get("created_at") else None,
             "updated_at": project.get("updated_at").isoformat() if project.get("updated_at") else None,
         }
-        return jsonify(result)
+        return conditional(jsonify(result), etag, modified)
     else:
         # Obtener de SQLite/PostgreSQL
         try:
@@ -297,14 +263,26 @@ def get_project(project_id: str):
             return jsonify({"error": "Invalid project ID"}), 400
         
         p = Project.query.get_or_404(project_id_int)
-        return jsonify(project_to_dict_with_token(p))
+        etag, modified = make_etag("project", p.id, p.updated_at, p.share_token), p.updated_at
+        cached = not_modified(etag, modified)
+        if cached:
+            return cached
+        return conditional(jsonify(project_to_dict_with_token(p)), etag, modified)
 
 
 # ============= Listing Operations =============
 @projects_bp.get("")
 @limiter.limit("60/minute")
 def list_projects():
-    """List projects with optional filtering."""
+    """List projects with optional filtering.
+
+    ``fields=summary`` (or a comma-separated field list) returns only those
+    fields and reads only the columns they need.
+    """
+    try:
+        fields = parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     owner_filter = request.args.get("owner")
     user_id_str = None
     try:
@@ -329,7 +307,9 @@ def list_projects():
             target_user_id = user_id_str
         
         if target_user_id:
-            projects = firebase_service.get_user_projects(target_user_id)
+            projects = firebase_service.get_user_projects(
+                target_user_id, fields=_firestore_mask(fields, "category", "featured")
+            )
         else:
             # Si no hay filtro de usuario, obtener todos (esto necesita mejorarse en el futuro)
             projects = []
@@ -342,39 +322,31 @@ def list_projects():
             projects = [p for p in projects if p.get("category") == category]
         if featured is not None:
             projects = [p for p in projects if p.get("featured") == (featured.lower() == "true")]
+        etag = _docs_etag(projects, "list", user_id_str, request.full_path)
+        cached = not_modified(etag, private=True)
+        if cached:
+            return cached
+        if fields:
+            return conditional(jsonify([project_fields(p, fields) for p in projects]), etag, private=True)
         
         # Convertir a formato esperado
         result = []
         for p in projects:
-            # Asegurar que images y links sean strings JSON válidos
-            images = p.get("images")
-            if images is None:
-                images = "[]"
-            elif not isinstance(images, str):
-                # Si es una lista (puede pasar si Firestore lo retorna como lista)
-                images = json.dumps(images) if images else "[]"
-            
-            links = p.get("links")
-            if links is None:
-                links = "[]"
-            elif not isinstance(links, str):
-                links = json.dumps(links) if links else "[]"
-            
             result.append({
                 "id": p.get("id"),
                 "user_id": p.get("user_id"),
                 "title": p.get("title", ""),
                 "description": p.get("description", ""),
                 "technologies": p.get("technologies", ""),
-                "images": images,
-                "links": links,
+                "images": legacy_json(p.get("images")),
+                "links": legacy_json(p.get("links")),
                 "category": p.get("category", "general"),
                 "featured": p.get("featured", False),
                 "share_token": p.get("share_token"),
                 "created_at": p.get("created_at").isoformat() if p.get("created_at") else None,
                 "updated_at": p.get("updated_at").isoformat() if p.get("updated_at") else None,
             })
-        return jsonify(result)
+        return conditional(jsonify(result), etag, private=True)
     else:
         # Obtener de SQLite/PostgreSQL
         user_id = int(user_id_str) if user_id_str and user_id_str.isdigit() else None
@@ -392,112 +364,329 @@ def list_projects():
             q = q.filter(Project.category == sanitize_str(category, 128))
         if featured is not None:
             q = q.filter(Project.featured == (featured.lower() == "true"))
+        etag = _rows_etag(q, "list", user_id_str, request.full_path)
+        cached = not_modified(etag, private=True)
+        if cached:
+            return cached
+        if fields:
+            items = q.options(_sparse_columns(fields)).order_by(Project.created_at.desc()).all()
+            return conditional(jsonify([project_fields(p, fields) for p in items]), etag, private=True)
         items = q.order_by(Project.created_at.desc()).all()
-        return jsonify([project_to_dict_with_token(p) for p in items])
+        return conditional(jsonify([project_to_dict_with_token(p) for p in items]), etag, private=True)
+
+
+PUBLIC_COUNT_TTL = 60
+
+
+def _public_item(p: dict) -> dict:
+    """Explore-feed representation of a Firestore project document."""
+    return {
+        "id": p.get("id", ""),
+        "title": p.get("title", ""),
+        "description": p.get("description", ""),
+        "technologies": p.get("technologies", ""),
+        "category": p.get("category", "general"),
+        "featured": p.get("featured", False),
+        "images": legacy_json(p.get("images")),
+        "links": legacy_json(p.get("links")),
+        "share_token": p.get("share_token", ""),
+        "created_at": str(p.get("created_at", "")),
+        "updated_at": str(p.get("updated_at", "")),
+    }
+
+
+def _public_count(category: str | None, term: str | None, count) -> int:
+    """Total for page mode, cached briefly per filter so it is not recounted on every page."""
+    key = "projects:public:count:" + json.dumps([category or "", term or ""])
+    return tagged_cache.get_or_set(key, _feed_tags(category), count, timeout=PUBLIC_COUNT_TTL)
+
+
+def _feed_tags(category: str | None) -> list[str]:
+    return [feed_category_tag(category)] if category else [FEED_TAG]
+
+
+def _page_anchor_key(category: str | None, order: str, per_page: int, page: int) -> str:
+    return "projects:public:anchor:" + json.dumps([category or "", order, per_page, page])
+
+
+def _feed_snapshot_key() -> tuple[str | None, list[str]]:
+    """Snapshot key of an explore request, or None when it is not one of the
+    first ``PROJECTS_FEED_CACHED_PAGES`` pages of the unfiltered-by-text feed."""
+    args = request.args
+    if (args.get("q") or "").strip():
+        return None, []
+    try:
+        per_page = min(max(int(args.get("per_page", 20)), 1), 50)
+        page = max(int(args.get("page", 1)), 1)
+    except ValueError:
+        return None, []
+    if "cursor" in args:
+        # Solo la primera página: las siguientes dependen del cursor
+        if (args.get("cursor") or "").strip():
+            return None, []
+        position = "cursor"
+    elif page <= int(current_app.config.get("PROJECTS_FEED_CACHED_PAGES", 3)):
+        position = page
+    else:
+        return None, []
+    order = "old" if (args.get("order") or "new").lower() == "old" else "new"
+    category = sanitize_str(args.get("category"), 128) or None
+    with_total = (args.get("with_total") or "false").lower() == "true"
+    try:
+        fields = parse_fields(args.get("fields"))
+    except ValueError:
+        return None, []
+    key = "projects:public:page:" + json.dumps(
+        [category or "", order, per_page, position, with_total, ",".join(fields or ())]
+    )
+    return key, _feed_tags(category)
 
 
 @projects_bp.get("/public")
 @limiter.limit("120/minute")
 def list_public_projects():
-    """Public explore endpoint with pagination and filters."""
-    page = max(int(request.args.get("page", 1)), 1)
+    """Public explore endpoint with pagination and filters.
+
+    ``page``/``per_page`` keeps the classic response with ``total``. Passing
+    ``cursor`` (empty for the first page) switches to keyset pagination on
+    ``(created_at, id)``: the response carries ``next_cursor`` and ``total`` is
+    only computed when ``with_total=true``. With ``q`` results come from the
+    full-text index, ranked by relevance (cursors then hold an offset).
+
+    The first pages of each category/order are kept as rendered snapshots
+    tagged with the feed version; project writes invalidate only the feeds
+    they touch. The snapshot hash is sent as ETag.
+    """
+    key, tags = _feed_snapshot_key()
+    if key is None or not tagged_cache.enabled:
+        return _uncached_public_response()
+
+    live = {}
+
+    def build():
+        resp = make_response(_public_projects_response())
+        if resp.status_code != 200:
+            live["response"] = resp
+            return None
+        body = resp.get_data()
+        return {"etag": hashlib.sha1(body).hexdigest()[:20], "body": body}
+
+    snapshot = tagged_cache.get_or_set(
+        key, tags, build, timeout=int(current_app.config.get("PROJECTS_FEED_CACHE_TTL", 300))
+    )
+    if snapshot is None:
+        return live["response"]
+    resp = current_app.response_class(snapshot["body"], mimetype="application/json")
+    resp.set_etag(snapshot["etag"])
+    resp.cache_control.no_cache = True
+    resp.cache_control.public = True
+    return resp.make_conditional(request)
+
+
+def _uncached_public_response():
+    """Deep pages and text searches. With SQL the ETag is built from the feed
+    tag versions that every project write bumps, so a revalidation costs no
+    query. Firestore answers, and every answer when the tagged cache is off
+    (tag versions are not shared between workers), are validated by their
+    body hash."""
+    firestore_mode = current_app.config.get("USE_FIREBASE", False) and firebase_service.is_enabled
+    if firestore_mode or not tagged_cache.enabled:
+        resp = make_response(_public_projects_response())
+        if resp.status_code == 200:
+            resp.add_etag()
+            resp.cache_control.no_cache = True
+            resp.make_conditional(request)
+        return resp
+    category = sanitize_str(request.args.get("category"), 128) or None
+    etag = make_etag("public", request.full_path, *(tagged_cache.version(t) for t in _feed_tags(category)))
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    resp = make_response(_public_projects_response())
+    if resp.status_code != 200:
+        return resp
+    return conditional(resp, etag)
+
+
+def _public_projects_response():
+    try:
+        fields = parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # created_at siempre se lee: es la posición de los cursores y anclas de página
+    mask = _firestore_mask(fields, "created_at")
     per_page = min(max(int(request.args.get("per_page", 20)), 1), 50)
-    
+    order = "old" if (request.args.get("order") or "new").lower() == "old" else "new"
+    # Mismo valor que la clave del snapshot (_feed_snapshot_key)
+    category = sanitize_str(request.args.get("category"), 128) or None
+    term = sanitize_str(request.args.get("q") or "", 255)
+    cursor_mode = "cursor" in request.args
+    with_total = (request.args.get("with_total") or "false").lower() == "true"
+
     use_firebase = current_app.config.get("USE_FIREBASE", False)
-    
-    if use_firebase and firebase_service.is_enabled:
-        # Firebase: obtener todos los proyectos públicos
-        # Firestore no soporta consultas sin filtros de manera eficiente,
-        # así que obtenemos todos y filtramos/ordenamos en Python
-        all_projects = firebase_service.get_all_projects()
-        
-        # Aplicar filtros
-        category = request.args.get("category")
-        if category:
-            all_projects = [p for p in all_projects if p.get("category") == category]
-        
-        term = request.args.get("q")
-        if term:
-            term_lower = term.lower()
-            all_projects = [
-                p for p in all_projects
-                if term_lower in (p.get("title", "") or "").lower() or
-                   term_lower in (p.get("description", "") or "").lower()
-            ]
-        
-        # Ordenar
-        order = (request.args.get("order") or "new").lower()
-        if order == "old":
-            all_projects.sort(key=lambda p: p.get("created_at", datetime.min))
-        else:
-            all_projects.sort(key=lambda p: p.get("created_at", datetime.min), reverse=True)
-        
-        # Paginación
-        total = len(all_projects)
-        start = (page - 1) * per_page
-        end = start + per_page
-        items = all_projects[start:end]
-        
-        # Convertir a formato de respuesta
-        result = []
-        for p in items:
-            # Asegurar que images y links sean strings JSON válidos
-            images = p.get("images")
-            if images is None:
-                images = "[]"
-            elif not isinstance(images, str):
-                images = json.dumps(images) if images else "[]"
-            
-            links = p.get("links")
-            if links is None:
-                links = "[]"
-            elif not isinstance(links, str):
-                links = json.dumps(links) if links else "[]"
-            
-            result.append({
-                "id": p.get("id", ""),
-                "title": p.get("title", ""),
-                "description": p.get("description", ""),
-                "technologies": p.get("technologies", ""),
-                "category": p.get("category", "general"),
-                "featured": p.get("featured", False),
-                "images": images,
-                "links": links,
-                "share_token": p.get("share_token", ""),
-                "created_at": str(p.get("created_at", "")),
-                "updated_at": str(p.get("updated_at", "")),
+    firestore_mode = use_firebase and firebase_service.is_enabled
+    # Términos sin palabras indexables (o SQL sin índice de texto completo): subcadena
+    ranked = bool(query_tokens(term)) and (firestore_mode or project_search.sql_backend() != "like")
+    # Firestore filtra la subcadena en memoria, así que también pagina por offset
+    offset_paged = ranked or (firestore_mode and bool(term))
+    cursor_order = "relevance" if ranked else order
+    if fields:
+        def fs_item(p):
+            return project_fields(p, fields)
+        sql_item = fs_item
+    else:
+        fs_item, sql_item = _public_item, project_to_dict
+
+    if cursor_mode:
+        try:
+            position = decode_cursor(
+                (request.args.get("cursor") or "").strip(), cursor_order, id_type=str if firestore_mode else int
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        offset = 0
+        if offset_paged:
+            if isinstance(position, tuple):
+                return jsonify({"error": "invalid cursor"}), 400
+            offset, position = position or 0, None
+    else:
+        page = max(int(request.args.get("page", 1)), 1)
+        offset = (page - 1) * per_page
+
+    def ranked_response(items: list, total: int, serialize):
+        if cursor_mode:
+            has_more = offset + per_page < total
+            return jsonify({
+                "per_page": per_page,
+                "items": [serialize(p) for p in items],
+                "next_cursor": encode_offset_cursor(offset + per_page, cursor_order) if has_more else None,
+                "total": total if with_total else None,
             })
-        
         return jsonify({
             "page": page,
             "per_page": per_page,
             "total": total,
-            "items": result,
+            "items": [serialize(p) for p in items],
         })
-    else:
-        # Local: usar SQL
-        q = Project.query
-        category = request.args.get("category")
-        if category:
-            q = q.filter(Project.category == sanitize_str(category, 128))
-        term = request.args.get("q")
+
+    if firestore_mode:
+        if ranked:
+            # Firestore no tiene búsqueda de texto: índice invertido local, ordenado por relevancia
+            matches = project_search.search_documents(term, category)
+            return ranked_response(matches[offset:offset + per_page], len(matches), fs_item)
         if term:
-            t = f"%{sanitize_str(term, 255)}%"
-            q = q.filter(or_(Project.title.ilike(t), Project.description.ilike(t)))
-        order = (request.args.get("order") or "new").lower()
-        if order == "old":
-            q = q.order_by(Project.created_at.asc())
-        else:
-            q = q.order_by(Project.created_at.desc())
-        total = q.count()
-        items = q.offset((page - 1) * per_page).limit(per_page).all()
+            matches = project_search.filter_documents(term, category, descending=(order == "new"))
+            return ranked_response(matches[offset:offset + per_page], len(matches), fs_item)
+
+        if cursor_mode:
+            # Firestore: solo se lee una página (limit + start_after)
+            docs = firebase_service.get_projects_page(
+                per_page + 1, category=category, descending=(order == "new"), start_after=position, fields=mask
+            )
+            has_more = len(docs) > per_page
+            docs = docs[:per_page]
+            last = docs[-1] if docs else None
+            return jsonify({
+                "per_page": per_page,
+                "items": [fs_item(p) for p in docs],
+                "next_cursor": encode_cursor(last.get("created_at"), last.get("id"), order) if has_more else None,
+                "total": (
+                    _public_count(category, None, lambda: firebase_service.count_projects(category))
+                    if with_total else None
+                ),
+            })
+
+        # Páginas numeradas: la app pide las páginas en orden, así que el último
+        # proyecto de la página anterior (guardado en caché) sirve de cursor y
+        # solo se lee una página; sin él se usa offset
+        anchor = tagged_cache.get(_page_anchor_key(category, order, per_page, page - 1), _feed_tags(category)) if page > 1 else None
+        docs = firebase_service.get_projects_page(
+            per_page,
+            category=category,
+            descending=(order == "new"),
+            start_after=anchor,
+            offset=0 if anchor or page == 1 else offset,
+            fields=mask,
+        )
+        if len(docs) == per_page:
+            tagged_cache.set(
+                _page_anchor_key(category, order, per_page, page),
+                (docs[-1].get("created_at"), docs[-1].get("id")),
+                _feed_tags(category),
+                timeout=PUBLIC_COUNT_TTL,
+            )
         return jsonify({
             "page": page,
             "per_page": per_page,
-            "total": total,
-            "items": [project_to_dict(p) for p in items],
+            "total": _public_count(category, None, lambda: firebase_service.count_projects(category)),
+            "items": [fs_item(p) for p in docs],
         })
 
+    # Local: usar SQL
+    if ranked:
+        found = project_search.search_ids(term, category, per_page, offset)
+        if found is not None:
+            ids, total = found
+            rows = Project.query.filter(Project.id.in_(ids))
+            if fields:
+                rows = rows.options(_sparse_columns(fields))
+            by_id = {p.id: p for p in rows.all()} if ids else {}
+            return ranked_response([by_id[i] for i in ids if i in by_id], total, sql_item)
+
+    q = Project.query
+    if category:
+        q = q.filter(Project.category == category)
+    if term:
+        # Sin índice de texto completo (falta setup): búsqueda por subcadena
+        t = f"%{term}%"
+        q = q.filter(or_(Project.title.ilike(t), Project.description.ilike(t)))
+    # id desempata proyectos creados en el mismo instante (ix_projects_created_id)
+    if order == "old":
+        ordered = q.order_by(Project.created_at.asc(), Project.id.asc())
+    else:
+        ordered = q.order_by(Project.created_at.desc(), Project.id.desc())
+    if fields:
+        ordered = ordered.options(_sparse_columns(fields))
+
+    if ranked:
+        # El índice no respondió: subcadena, paginada por offset igual que la búsqueda ranqueada
+        items = ordered.offset(offset).limit(per_page).all()
+        return ranked_response(items, q.order_by(None).count(), sql_item)
+
+    if cursor_mode:
+        page_q = ordered
+        if position is not None:
+            created_at, last_id = position
+            if order == "old":
+                page_q = page_q.filter(or_(
+                    Project.created_at > created_at,
+                    and_(Project.created_at == created_at, Project.id > last_id),
+                ))
+            else:
+                page_q = page_q.filter(or_(
+                    Project.created_at < created_at,
+                    and_(Project.created_at == created_at, Project.id < last_id),
+                ))
+        rows = page_q.limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        last = rows[-1] if rows else None
+        return jsonify({
+            "per_page": per_page,
+            "items": [sql_item(p) for p in rows],
+            "next_cursor": encode_cursor(last.created_at, last.id, order) if has_more else None,
+            "total": _public_count(category, term, q.order_by(None).count) if with_total else None,
+        })
+
+    total = _public_count(category, term, q.order_by(None).count)
+    items = ordered.offset(offset).limit(per_page).all()
+    return jsonify({
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "items": [sql_item(p) for p in items],
+    })
+
 
 # ============= Sharing Operations =============
 @projects_bp.post("/<project_id>/share")
@@ -526,6 +715,7 @@ def share_project(project_id: str):
             # Actualizar el proyecto con el nuevo token usando save_project con merge=True
             project_data["share_token"] = share_token
             firebase_service.save_project(project_id, project_data)
+            _invalidate_feed(project_data.get("category"))
         
         return jsonify({
             "share_token": share_token,
@@ -542,7 +732,7 @@ def share_project(project_id: str):
         if not p.share_token:
             p.share_token = secrets.token_urlsafe(16)
             db.session.commit()
-            cache.clear()
+            _invalidate_feed(p.category)
         return jsonify({
             "share_token": p.share_token,
             "share_url": f"/api/projects/shared/{p.share_token}",
@@ -598,7 +788,6 @@ def share_portfolio():
         if not user.portfolio_share_token:
             user.portfolio_share_token = secrets.token_urlsafe(16)
             db.session.commit()
-            cache.clear()
         return jsonify({
             "share_token": user.portfolio_share_token,
             "share_url": f"/api/projects/portfolio/{user.portfolio_share_token}",
@@ -615,6 +804,10 @@ def get_shared_portfolio(token: str):
     wants_html = "text/html" in accept or request.args.get("view") == "1"
     if wants_html:
         return redirect(f"/share/pf/{token}", code=302)
+    try:
+        fields = parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
     use_firebase = current_app.config.get("USE_FIREBASE", False)
     
@@ -626,24 +819,17 @@ def get_shared_portfolio(token: str):
         
         user_id = user.get("id")
         # Obtener proyectos del usuario
-        projects = firebase_service.get_user_projects(user_id)
+        projects = firebase_service.get_user_projects(user_id, fields=_firestore_mask(fields))
+        etag = _docs_etag(projects, "portfolio", token, request.full_path)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        if fields:
+            return conditional(jsonify([project_fields(p, fields) for p in projects]), etag)
         
         # Convertir a formato de respuesta
         result = []
         for p in projects:
-            # Asegurar que images y links sean strings JSON válidos
-            images = p.get("images")
-            if images is None:
-                images = "[]"
-            elif not isinstance(images, str):
-                images = json.dumps(images) if images else "[]"
-            
-            links = p.get("links")
-            if links is None:
-                links = "[]"
-            elif not isinstance(links, str):
-                links = json.dumps(links) if links else "[]"
-            
             result.append({
                 "id": p.get("id", ""),
                 "title": p.get("title", ""),
@@ -651,17 +837,23 @@ def get_shared_portfolio(token: str):
                 "technologies": p.get("technologies", ""),
                 "category": p.get("category", "general"),
                 "featured": p.get("featured", False),
-                "images": images,
-                "links": links,
+                "images": legacy_json(p.get("images")),
+                "links": legacy_json(p.get("links")),
                 "share_token": p.get("share_token", ""),
                 "created_at": str(p.get("created_at", "")),
             })
         
-        return jsonify(result)
+        return conditional(jsonify(result), etag)
     else:
         # Local: usar SQL
         user = User.query.filter_by(portfolio_share_token=token).first_or_404()
-        projects = Project.query.filter_by(user_id=user.id).order_by(
-            Project.created_at.desc()
-        ).all()
-        return jsonify([project_to_dict(p) for p in projects])
+        q = Project.query.filter_by(user_id=user.id)
+        etag = _rows_etag(q, "portfolio", token, request.full_path)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        if fields:
+            projects = q.options(_sparse_columns(fields)).order_by(Project.created_at.desc()).all()
+            return conditional(jsonify([project_fields(p, fields) for p in projects]), etag)
+        projects = q.order_by(Project.created_at.desc()).all()
+        return conditional(jsonify([project_to_dict(p) for p in projects]), etag)
@@ -1,8 +1,8 @@
-import json
 from flask import Blueprint, render_template, abort, request, url_for, current_app
 from backend.extensions import limiter
 from backend.models import User, Project
 from backend.firebase_service import firebase_service
+from backend.db_utils import coerce_list
 
 
 share_bp = Blueprint("share", __name__)
@@ -30,27 +30,6 @@ def _make_absolute_url(path: str) -> str:
     return f"{base}/{path}"
 
 
-def _parse_list_field(raw: str) -> list[str]:
-    """Parse a list field that may be stored as JSON array or plain text.
-    Accepts JSON like '["/a","/b"]' or plain text separated by newlines/commas.
-    Returns a list of trimmed non-empty strings.
-    """
-    if not raw:
-        return []
-    # Try JSON first
-    try:
-        data = json.loads(raw)
-        if isinstance(data, list):
-            return [str(x).strip() for x in data if str(x).strip()]
-    except Exception:
-        pass
-    # Fallback: split by newlines and commas
-    parts = []
-    for line in str(raw).split("\n"):
-        parts.extend(line.split(","))
-    return [p.strip() for p in parts if p and p.strip()]
-
-
 @share_bp.get("/p/<token>")
 @limiter.limit("120/minute")
 def share_project_page(token: str):
@@ -69,9 +48,7 @@ def share_project_page(token: str):
         portfolio_token = owner.get("portfolio_share_token") if owner else None
         
         # Process images: Firebase almacena como array
-        raw_images = project.get("images") or []
-        if isinstance(raw_images, str):
-            raw_images = _parse_list_field(raw_images)
+        raw_images = coerce_list(project.get("images"))
         images = [_make_absolute_url(img) if not img.startswith("http") else img for img in raw_images]
         
         # Build a simple ViewModel
@@ -80,11 +57,9 @@ def share_project_page(token: str):
             "description": project.get("description") or "",
             "technologies": [t.strip() for t in (project.get("technologies") or "").split(";") if t.strip()] or [],
             "images": images,
-            "links": project.get("links") or [],
+            "links": coerce_list(project.get("links")),
             "category": project.get("category") or "general",
         }
-        if isinstance(vm["links"], str):
-            vm["links"] = _parse_list_field(vm["links"])
     else:
         # Local: usar SQL
         project = Project.query.filter_by(share_token=token).first()
@@ -94,8 +69,8 @@ def share_project_page(token: str):
         owner = User.query.get(project.user_id)
         portfolio_token = owner.portfolio_share_token if owner else None
         
-        # Process images: parse list field and convert to absolute URLs
-        raw_images = _parse_list_field(project.images or "")
+        # Process images: convert to absolute URLs
+        raw_images = coerce_list(project.images)
         images = [_make_absolute_url(img) for img in raw_images]
         
         # Build a simple ViewModel
@@ -104,7 +79,7 @@ def share_project_page(token: str):
             "description": project.description or "",
             "technologies": [t.strip() for t in (project.technologies or "").split(";") if t.strip()] or [],
             "images": images,
-            "links": _parse_list_field(project.links or ""),
+            "links": coerce_list(project.links),
             "category": project.category or "general",
         }
     
@@ -133,9 +108,7 @@ def share_portfolio_page(token: str):
         
         items = []
         for p in projects:
-            images_list = p.get("images") or []
-            if isinstance(images_list, str):
-                images_list = _parse_list_field(images_list)
+            images_list = coerce_list(p.get("images"))
             first = images_list[0] if images_list else None
             # Si la imagen ya es URL absoluta (Firebase Storage), no modificar
             if first and first.startswith("http"):
@@ -178,7 +151,7 @@ def share_portfolio_page(token: str):
         projects = Project.query.filter_by(user_id=user.id).order_by(Project.created_at.desc()).all()
         items = []
         for p in projects:
-            images_list = _parse_list_field(p.images or "")
+            images_list = coerce_list(p.images)
             first = images_list[0] if images_list else None
             cover_absolute = _make_absolute_url(first) if first else None
             items.append({
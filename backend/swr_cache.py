@@ -0,0 +1,122 @@
+"""Stale-while-revalidate cache with single-flight misses.
+
+Entries live in the Flask-Caching backend with a soft expiry: after ``ttl``
+seconds they are *stale* but are still served for another ``stale_ttl`` seconds
+while one background thread recomputes them. Concurrent misses (and a miss that
+arrives during a background refresh) for the same key wait for the one
+in-flight computation instead of each hitting upstream. Coalescing is per
+worker process.
+"""
+import time
+import logging
+import threading
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Exception | None = None
+
+
+class StaleWhileRevalidateCache:
+    """SWR wrapper around a Flask-Caching ``Cache`` for one namespace of keys."""
+
+    def __init__(self, cache, namespace: str, ttl: float = 300, stale_ttl: float = 1800):
+        self._cache = cache
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._flights: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "coalesced": 0, "refreshes": 0, "errors": 0}
+
+    def init_app(self, app, prefix: str):
+        self.ttl = float(app.config.get(f"{prefix}_TTL", self.ttl))
+        self.stale_ttl = float(app.config.get(f"{prefix}_STALE_TTL", self.stale_ttl))
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get_or_compute(self, key: str, compute):
+        """Return the cached value for ``key``, computing it at most once at a time.
+
+        ``compute`` must not depend on the request context: stale entries are
+        refreshed from a background thread that only has the app context.
+        """
+        entry = self._cache.get(self._key(key))
+        if entry is not None:
+            if time.time() < entry["fresh_until"]:
+                self._count("hits")
+            else:
+                self._count("stale")
+                self._refresh_async(key, compute)
+            return entry["value"]
+        self._count("misses")
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            self._count("coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        self._run(key, flight, compute)
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _run(self, key: str, flight: _Flight, compute) -> None:
+        try:
+            flight.value = compute()
+            self._cache.set(
+                self._key(key),
+                {"value": flight.value, "fresh_until": time.time() + self.ttl},
+                timeout=int(self.ttl + self.stale_ttl),
+            )
+        except Exception as e:
+            self._count("errors")
+            flight.error = e
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _refresh_async(self, key: str, compute) -> None:
+        with self._lock:
+            if key in self._flights:
+                return
+            flight = self._flights[key] = _Flight()
+            self._stats["refreshes"] += 1
+        app = current_app._get_current_object()
+
+        def run():
+            with app.app_context():
+                self._run(key, flight, compute)
+            if flight.error is not None:
+                logger.warning("cache refresh %s failed: %s", self._key(key), flight.error)
+
+        threading.Thread(target=run, name="swr-refresh", daemon=True).start()
+
+    def delete(self, key: str) -> None:
+        self._cache.delete(self._key(key))
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+            data["in_flight"] = len(self._flights)
+        lookups = data["hits"] + data["stale"] + data["misses"]
+        data["hit_ratio"] = round((data["hits"] + data["stale"]) / lookups, 3) if lookups else None
+        data["ttl"] = self.ttl
+        data["stale_ttl"] = self.stale_ttl
+        return data